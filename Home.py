@@ -6,25 +6,57 @@ Streamlit UI for Prediction Model v3.0 + Dependency Injection Services
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import hashlib
+import io
 import json
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
 import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from zoneinfo import ZoneInfo
 
+from prediction_model_v3 import PredictionEngine
+from instrument_identifier import US500_UPLOAD_RULES, instrument_from_upload_name
+
 # Import DI accessors for services
 from src.di.accessors import (
     get_top_predictions,
     get_prediction_count,
     save_prediction,
-    get_predictions_by_instrument
+    get_storage_service
 )
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# History result highlight templates
+_BULL_HTML = (
+    '<div style="background-color: #00AA0020; padding: 15px; border-radius: 5px; border-left: 4px solid #00AA00;">'
+    '<span style="color: #00AA00; font-size: 24px; font-weight: bold;">▲ BULLISH</span><br>'
+    '<span style="font-size: 18px;">Confidence: {confidence:.2f}%</span></div>'
+)
+_BEAR_HTML = (
+    '<div style="background-color: #FF000020; padding: 15px; border-radius: 5px; border-left: 4px solid #FF0000;">'
+    '<span style="color: #FF0000; font-size: 24px; font-weight: bold;">▼ BEARISH</span><br>'
+    '<span style="font-size: 18px;">Confidence: {confidence:.2f}%</span></div>'
+)
+
+# Columns every uploaded CSV must provide
+_REQUIRED_COLS = ('time', 'open', 'high', 'low', 'close')
+_REQUIRED = frozenset(_REQUIRED_COLS)
+
+# Parsed uploads are cached here as Parquet, keyed by parser version and file hash.
+# Bump the version whenever _parse_ohlc_csv changes so older frames are not served.
+_UPLOAD_CACHE_DIR = Path('.cache/uploads')
+_UPLOAD_CACHE_VERSION = b'ohlc-parquet-v1'
+_UPLOAD_CACHE_MAX_FILES = 50
+_UPLOAD_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds
+
 # Configure page
 st.set_page_config(
     page_title="Financial Prediction Dashboard",
@@ -71,6 +103,56 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Timezones are built once at import rather than per rerun
+_UTC = ZoneInfo("UTC")
+_ET = ZoneInfo("America/New_York")
+_TZ_CACHE = {
+    'US100': _ET,
+    'US500': ZoneInfo("America/Chicago"),
+    'UK100': ZoneInfo("Europe/London"),
+    'UTC': _UTC,
+}
+
+
+# Market status lookup tables
+
+
+def _build_market_hours():
+    """
+    Precompute market open flags and reasons for every (weekday, minute) in ET.
+
+    Futures market hours: Sunday 6 PM (22:00 Sunday ET) to Friday 5 PM (17:00 Friday ET)
+    With 1 hour break from 5 PM to 6 PM ET each day
+    """
+    is_open = np.zeros((7, 1440), dtype=bool)
+    reasons = np.empty((7, 1440), dtype=object)
+
+    for weekday in range(7):  # 0=Monday, 6=Sunday
+        for minutes_since_midnight in range(1440):
+            if weekday == 6:  # Sunday
+                if minutes_since_midnight >= 22 * 60:  # After 10 PM ET Sunday
+                    open_, reason = True, "Sunday evening opening"
+                else:
+                    open_, reason = False, "Market closed (awaiting Sunday opening)"
+            elif weekday < 5:  # Monday to Friday
+                if minutes_since_midnight < 17 * 60:  # Before 5 PM ET (market hours)
+                    open_, reason = True, "Regular trading hours"
+                elif minutes_since_midnight >= 18 * 60:  # After 6 PM ET (resume trading)
+                    open_, reason = True, "Evening trading"
+                else:  # 5 PM - 6 PM ET
+                    open_, reason = False, "Daily closing break (5-6 PM ET)"
+            else:  # Saturday
+                open_, reason = False, "Market closed (weekend)"
+
+            is_open[weekday, minutes_since_midnight] = open_
+            reasons[weekday, minutes_since_midnight] = reason
+
+    return is_open, reasons
+
+
+_OPEN, _REASON = _build_market_hours()
+
+
 # Market status helper function
 def get_market_status(instrument: str, current_time: datetime = None) -> dict:
     """
@@ -82,43 +164,15 @@ def get_market_status(instrument: str, current_time: datetime = None) -> dict:
     - US100 (NASDAQ): Sunday 6pm - Friday 5pm ET (continuous with short break)
     """
     if current_time is None:
-        current_time = datetime.now(ZoneInfo("UTC"))
+        current_time = datetime.now(_UTC)
     
     # Convert to ET for consistency
-    et_time = current_time.astimezone(ZoneInfo("America/New_York"))
+    et_time = current_time.astimezone(_ET)
     weekday = et_time.weekday()  # 0=Monday, 6=Sunday
-    hour = et_time.hour
-    minute = et_time.minute
-    
-    # Convert to minutes since midnight for easier comparison
-    minutes_since_midnight = hour * 60 + minute
-    
-    # Futures market hours: Sunday 6 PM (22:00 Sunday ET) to Friday 5 PM (17:00 Friday ET)
-    # With 1 hour break from 5 PM to 6 PM ET each day
-    
-    is_open = False
-    reason = ""
-    
-    if weekday == 6:  # Sunday
-        if minutes_since_midnight >= 22 * 60:  # After 10 PM ET Sunday
-            is_open = True
-            reason = "Sunday evening opening"
-        else:
-            is_open = False
-            reason = "Market closed (awaiting Sunday opening)"
-    elif weekday < 5:  # Monday to Friday
-        if minutes_since_midnight < 17 * 60:  # Before 5 PM ET (market hours)
-            is_open = True
-            reason = "Regular trading hours"
-        elif minutes_since_midnight >= 18 * 60:  # After 6 PM ET (resume trading)
-            is_open = True
-            reason = "Evening trading"
-        else:  # 5 PM - 6 PM ET
-            is_open = False
-            reason = "Daily closing break (5-6 PM ET)"
-    elif weekday == 5:  # Saturday
-        is_open = False
-        reason = "Market closed (weekend)"
+    minutes_since_midnight = et_time.hour * 60 + et_time.minute
+
+    is_open = bool(_OPEN[weekday, minutes_since_midnight])
+    reason = _REASON[weekday, minutes_since_midnight]
     
     return {
         'is_open': is_open,
@@ -127,6 +181,143 @@ def get_market_status(instrument: str, current_time: datetime = None) -> dict:
         'timestamp': et_time.isoformat()
     }
 
+
+_MISS = object()
+
+
+def _dig(d, *keys, default=None):
+    """Walk nested dict keys in one pass, returning default if any level is missing."""
+    for k in keys:
+        if not isinstance(d, dict):
+            return default
+        d = d.get(k, _MISS)
+        if d is _MISS:
+            return default
+    return d
+
+
+# Cached storage reads - reruns hit memory instead of the storage backend
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_latest(instruments: tuple) -> dict:
+    """Latest prediction (or None) per instrument, fetched concurrently and cached for 30 seconds."""
+    # Resolve the service here so worker threads don't race the container's lazy setup
+    service = get_storage_service()
+    with ThreadPoolExecutor(max_workers=len(instruments)) as executor:
+        return dict(zip(instruments, executor.map(service.get_latest_prediction, instruments)))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_top(n: int) -> list:
+    """Top N predictions by data timestamp, cached for 30 seconds."""
+    return get_top_predictions(n=n)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_count() -> int:
+    """Total prediction count, cached for 30 seconds."""
+    return get_prediction_count()
+
+
+def _parse_ohlc_csv(file_bytes: bytes) -> pd.DataFrame:
+    """Parse uploaded OHLC CSV bytes into a UTC time-indexed DataFrame."""
+    df = pd.read_csv(
+        io.BytesIO(file_bytes),
+        usecols=list(_REQUIRED_COLS),
+        dtype={'open': 'float64', 'high': 'float64', 'low': 'float64', 'close': 'float64'},
+        engine='c'
+    )
+    # An explicit format skips per-row format inference, the slow part of datetime parsing
+    try:
+        df['time'] = pd.to_datetime(df['time'], utc=True, format='ISO8601', cache=True)
+    except ValueError:
+        df['time'] = pd.to_datetime(df['time'], utc=True, format='mixed', cache=True)
+    return df.set_index('time')
+
+
+@st.cache_data(show_spinner=False)
+def _load_ohlc(file_bytes: bytes) -> pd.DataFrame:
+    """
+    Load an uploaded OHLC file, cached in memory per process and on disk as Parquet.
+
+    The on-disk copy is keyed by the parser version and the SHA-256 of the file so
+    re-uploads skip CSV parsing.
+    """
+    digest = hashlib.sha256(_UPLOAD_CACHE_VERSION + file_bytes).hexdigest()
+    path = _UPLOAD_CACHE_DIR / f"{digest}.parquet"
+    if path.exists():
+        try:
+            df = pd.read_parquet(path)
+            path.touch()  # Keep recently used uploads at the front of the pruning order
+            return df
+        except Exception as e:
+            logger.warning(f"Could not read cached upload {path}: {e}")
+
+    df = _parse_ohlc_csv(file_bytes)
+    try:
+        _UPLOAD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path, compression='zstd')
+        _prune_upload_cache()
+    except Exception as e:
+        logger.warning(f"Could not cache upload to {path}: {e}")
+    return df
+
+
+def _prune_upload_cache():
+    """Drop cached uploads older than _UPLOAD_CACHE_MAX_AGE, then all but the newest _UPLOAD_CACHE_MAX_FILES."""
+    files = []
+    for f in _UPLOAD_CACHE_DIR.glob('*.parquet'):
+        try:
+            files.append((f.stat().st_mtime, f))
+        except OSError:
+            continue
+    files.sort(reverse=True)
+    cutoff = datetime.now().timestamp() - _UPLOAD_CACHE_MAX_AGE
+    for i, (mtime, f) in enumerate(files):
+        if i >= _UPLOAD_CACHE_MAX_FILES or mtime < cutoff:
+            f.unlink(missing_ok=True)
+
+
+@st.cache_resource
+def get_engine(instrument: str) -> PredictionEngine:
+    """PredictionEngine for an instrument, shared across reruns and sessions."""
+    return PredictionEngine(instrument=instrument)
+
+
+@st.cache_resource
+def _engine_lock(instrument: str) -> threading.Lock:
+    """Lock serializing analyze() on the shared engine, which keeps per-run level state."""
+    return threading.Lock()
+
+
+def _render_instrument(col, inst: str, label: str, latest: dict) -> None:
+    """Render the latest bias and market status for one instrument column."""
+    with col:
+        st.markdown(f"### {inst} ({label})")
+        if latest:
+            bias = _dig(latest, 'result', 'analysis', 'bias', default='UNKNOWN')
+            confidence = _dig(latest, 'result', 'analysis', 'confidence', default=0)
+            update_time = latest.get('analysis_timestamp', 'N/A')
+
+            bias_emoji = "🟢" if bias == "BULLISH" else "🔴"
+            st.markdown(f"**Bias:** {bias_emoji} {bias}")
+            st.metric("Confidence", f"{confidence:.1f}%")
+            st.caption(f"Updated: {update_time[:19] if update_time != 'N/A' else 'N/A'}")
+
+            # Market status
+            status = get_market_status(inst)
+            status_class = "market-open" if status['is_open'] else "market-closed"
+            st.markdown(f"**Market Status:** <span class='{status_class}'>{status['status']}</span>", unsafe_allow_html=True)
+            st.caption(status['reason'])
+        else:
+            st.info("No predictions available yet")
+
+
+def _clear_prediction_caches() -> None:
+    """Invalidate cached storage reads after new predictions are saved."""
+    _cached_latest.clear()
+    _cached_top.clear()
+    _cached_count.clear()
+
 # Note: Background scheduler disabled - all analysis is on-demand with manual CSV uploads
 
 # ========== SIDEBAR: INFORMATION ==========
@@ -144,6 +335,9 @@ with st.sidebar:
         help="Choose between analyzing new data or viewing past predictions"
     )
 
+    if st.button("🔄 Refresh", help="Reload saved predictions from storage"):
+        _clear_prediction_caches()
+
 # ========== MAIN CONTENT ==========
 
 # Title
@@ -154,78 +348,11 @@ st.divider()
 # ========== LATEST BIAS RESULTS SECTION ==========
 st.markdown("## 📈 Latest Market Bias Results")
 
-# Get latest predictions for each instrument
-us100_preds = get_predictions_by_instrument("US100")
-uk100_preds = get_predictions_by_instrument("UK100")
-us500_preds = get_predictions_by_instrument("US500")
-
-col1, col2, col3 = st.columns(3)
-
-# US100 Display
-with col1:
-    st.markdown("### US100 (NASDAQ)")
-    if us100_preds:
-        latest_us100 = sorted(us100_preds, key=lambda x: x.get('analysis_timestamp', ''), reverse=True)[0]
-        bias = latest_us100.get('result', {}).get('analysis', {}).get('bias', 'UNKNOWN')
-        confidence = latest_us100.get('result', {}).get('analysis', {}).get('confidence', 0)
-        update_time = latest_us100.get('analysis_timestamp', 'N/A')
-        
-        bias_emoji = "🟢" if bias == "BULLISH" else "🔴"
-        st.markdown(f"**Bias:** {bias_emoji} {bias}")
-        st.metric("Confidence", f"{confidence:.1f}%")
-        st.caption(f"Updated: {update_time[:19] if update_time != 'N/A' else 'N/A'}")
-        
-        # Market status
-        status = get_market_status("US100")
-        status_class = "market-open" if status['is_open'] else "market-closed"
-        st.markdown(f"**Market Status:** <span class='{status_class}'>{status['status']}</span>", unsafe_allow_html=True)
-        st.caption(status['reason'])
-    else:
-        st.info("No predictions available yet")
-
-# UK100 Display
-with col2:
-    st.markdown("### UK100 (FTSE)")
-    if uk100_preds:
-        latest_uk100 = sorted(uk100_preds, key=lambda x: x.get('analysis_timestamp', ''), reverse=True)[0]
-        bias = latest_uk100.get('result', {}).get('analysis', {}).get('bias', 'UNKNOWN')
-        confidence = latest_uk100.get('result', {}).get('analysis', {}).get('confidence', 0)
-        update_time = latest_uk100.get('analysis_timestamp', 'N/A')
-        
-        bias_emoji = "🟢" if bias == "BULLISH" else "🔴"
-        st.markdown(f"**Bias:** {bias_emoji} {bias}")
-        st.metric("Confidence", f"{confidence:.1f}%")
-        st.caption(f"Updated: {update_time[:19] if update_time != 'N/A' else 'N/A'}")
-        
-        # Market status
-        status = get_market_status("UK100")
-        status_class = "market-open" if status['is_open'] else "market-closed"
-        st.markdown(f"**Market Status:** <span class='{status_class}'>{status['status']}</span>", unsafe_allow_html=True)
-        st.caption(status['reason'])
-    else:
-        st.info("No predictions available yet")
-
-# US500 Display
-with col3:
-    st.markdown("### US500 (S&P 500)")
-    if us500_preds:
-        latest_us500 = sorted(us500_preds, key=lambda x: x.get('analysis_timestamp', ''), reverse=True)[0]
-        bias = latest_us500.get('result', {}).get('analysis', {}).get('bias', 'UNKNOWN')
-        confidence = latest_us500.get('result', {}).get('analysis', {}).get('confidence', 0)
-        update_time = latest_us500.get('analysis_timestamp', 'N/A')
-        
-        bias_emoji = "🟢" if bias == "BULLISH" else "🔴"
-        st.markdown(f"**Bias:** {bias_emoji} {bias}")
-        st.metric("Confidence", f"{confidence:.1f}%")
-        st.caption(f"Updated: {update_time[:19] if update_time != 'N/A' else 'N/A'}")
-        
-        # Market status
-        status = get_market_status("US500")
-        status_class = "market-open" if status['is_open'] else "market-closed"
-        st.markdown(f"**Market Status:** <span class='{status_class}'>{status['status']}</span>", unsafe_allow_html=True)
-        st.caption(status['reason'])
-    else:
-        st.info("No predictions available yet")
+dashboard_instruments = ('US100', 'UK100', 'US500')
+latest_predictions = _cached_latest(dashboard_instruments)
+
+for col, inst, label in zip(st.columns(3), dashboard_instruments, ('NASDAQ', 'FTSE', 'S&P 500')):
+    _render_instrument(col, inst, label, latest_predictions[inst])
 
 st.divider()
 
@@ -233,7 +360,7 @@ st.divider()
 if 'analysis_result' not in st.session_state:
     st.session_state.analysis_result = None
 if 'analysis_history' not in st.session_state:
-    st.session_state.analysis_history = []
+    st.session_state.analysis_history = deque(maxlen=50)  # Keep the 50 most recent analyses
 
 # Main content
 if analysis_mode == "Upload & Analyze":
@@ -247,23 +374,29 @@ if analysis_mode == "Upload & Analyze":
     )
 
     if uploaded_file is not None:
-        # Load CSV
-        df = pd.read_csv(uploaded_file)
+        file_bytes = uploaded_file.getvalue()
 
-        # Validate columns
-        required_cols = ['time', 'open', 'high', 'low', 'close']
-        missing_cols = set(required_cols) - set(df.columns)
+        # Validate columns from the header only
+        header = pd.read_csv(io.BytesIO(file_bytes), nrows=0).columns
+        missing_cols = _REQUIRED.difference(header)
 
         if missing_cols:
-            st.error(f"❌ Missing required columns: {', '.join(missing_cols)}")
-            st.info(f"Required columns: {', '.join(required_cols)}")
+            st.error(f"❌ Missing required columns: {', '.join(sorted(missing_cols))}")
+            st.info(f"Required columns: {', '.join(_REQUIRED_COLS)}")
         else:
+            # Load CSV (parsed once per upload, then served from cache)
+            try:
+                df = _load_ohlc(file_bytes)
+            except Exception as e:
+                st.error(f"❌ Could not parse CSV: {str(e)}")
+                st.stop()
+
             # Show preview
             st.subheader("📊 Data Preview")
             col1, col2 = st.columns(2)
             with col1:
                 st.write(f"**Total candles:** {len(df)}")
-                st.write(f"**Columns:** {', '.join(df.columns.tolist())}")
+                st.write(f"**Columns:** {', '.join(header)}")
             with col2:
                 st.write(f"**File size:** {uploaded_file.size / 1024:.1f} KB")
                 st.write(f"**Uploaded:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -278,42 +411,27 @@ if analysis_mode == "Upload & Analyze":
             if st.button("🔍 Analyze Data", key="analyze_btn", use_container_width=True):
                 with st.spinner("Running prediction analysis..."):
                     try:
-                        # Import prediction engine
-                        from prediction_model_v3 import PredictionEngine
-
-                        # Parse time column
-                        df['time'] = pd.to_datetime(df['time'], utc=True)
-                        df.set_index('time', inplace=True)
-
                         # Identify instrument from filename
                         filename = uploaded_file.name
-                        instrument = "US100"  # Default
-
-                        if "NQ" in filename.upper():
-                            instrument = "US100"
-                        elif "ES" in filename.upper() or "SP" in filename.upper() or "US500" in filename.upper():
-                            instrument = "US500"
-                        elif "UK100" in filename.upper() or "FTSE" in filename.upper():
-                            instrument = "UK100"
-
-                        # Get timezone mapping
-                        timezone_map = {
-                            'US100': 'America/New_York',
-                            'US500': 'America/Chicago',
-                            'UK100': 'Europe/London',
-                        }
+                        instrument = instrument_from_upload_name(filename, US500_UPLOAD_RULES)  # Default US100
 
-                        timezone = timezone_map.get(instrument, 'UTC')
+                        # Get timezone for instrument
+                        tz = _TZ_CACHE.get(instrument, _UTC)
+                        timezone = tz.key
 
-                        # Convert timezone
-                        df.index = df.index.tz_convert(timezone)
+                        # Convert timezone, skipping the index copy when it is already in tz
+                        if df.index.tz is None:
+                            df.index = df.index.tz_localize(_UTC).tz_convert(tz)
+                        elif df.index.tz != tz:
+                            df.index = df.index.tz_convert(tz)
 
                         # Get latest timestamp
-                        latest_timestamp = str(df.index[-1])
+                        latest_timestamp = df.index[-1].isoformat()
 
                         # Run prediction
-                        engine = PredictionEngine(instrument=instrument)
-                        result = engine.analyze(df, latest_timestamp)
+                        engine = get_engine(instrument)
+                        with _engine_lock(instrument):
+                            result = engine.analyze(df, latest_timestamp)
 
                         # Store result
                         st.session_state.analysis_result = {
@@ -323,7 +441,7 @@ if analysis_mode == "Upload & Analyze":
                             'timestamp': datetime.now().isoformat(),
                             'filename': filename,
                             'data_length': len(df),
-                            'current_price': df.iloc[-1]['close']
+                            'current_price': float(df['close'].iat[-1])
                         }
 
                         # Add to history
@@ -331,6 +449,7 @@ if analysis_mode == "Upload & Analyze":
 
                         # Auto-save to persistent storage
                         if save_prediction(st.session_state.analysis_result):
+                            _clear_prediction_caches()
                             logger.info("Prediction auto-saved to storage")
                         else:
                             logger.warning("Failed to auto-save prediction")
@@ -349,15 +468,35 @@ elif analysis_mode == "View History":
     st.markdown("Ranked by latest data point timestamp - newest data first")
 
     # Load top 50 predictions from persistent storage
-    predictions = get_top_predictions(n=50)
+    predictions = _cached_top(50)
 
     if not predictions:
         st.info("No analysis history yet. Upload and analyze a CSV file first.")
     else:
-        st.metric("Total Predictions Saved", get_prediction_count(), delta="in database")
+        st.metric("Total Predictions Saved", _cached_count(), delta="in database")
         st.divider()
 
-        for item in predictions:
+        # One summary table instead of a widget tree per prediction
+        summary_df = pd.DataFrame({
+            'Instrument': [item.get('instrument', 'UNKNOWN') for item in predictions],
+            'Bias': [_dig(item, 'result', 'analysis', 'bias', default='UNKNOWN') for item in predictions],
+            'Confidence (%)': [_dig(item, 'result', 'analysis', 'confidence', default=0) for item in predictions],
+            'Data Timestamp': [item.get('data_timestamp', 'N/A') for item in predictions],
+            'Analysis Timestamp': [item.get('analysis_timestamp', 'N/A') for item in predictions],
+        })
+        selection = st.dataframe(
+            summary_df,
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row"
+        )
+
+        if not selection.selection.rows:
+            st.caption("Select a row to view its full analysis details.")
+        else:
+            item = predictions[selection.selection.rows[0]]
+
             # Extract key information
             result = item.get('result', {})
             analysis = result.get('analysis', {})
@@ -365,60 +504,47 @@ elif analysis_mode == "View History":
             confidence = analysis.get('confidence', 0)
             analysis_time = item.get('analysis_timestamp', 'N/A')
             latest_data_time = item.get('data_timestamp', 'N/A')
-
-            # Create color-coded title
-            bias_color = "🟢" if bias == "BULLISH" else "🔴"
             instrument = item.get('instrument', 'UNKNOWN')
-            title = f"{bias_color} {instrument} - {bias} ({confidence:.1f}% confidence) | Data: {latest_data_time[:10]}"
-
-            with st.expander(title):
-                # Row 1: Timing Information
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write("**📅 Analysis Executed:**")
-                    st.write(f"{analysis_time[:10]} at {analysis_time[11:19]}" if analysis_time != 'N/A' else "N/A")
-                with col2:
-                    st.write("**📊 Latest Data Point:**")
-                    st.write(f"{latest_data_time[:10]} at {latest_data_time[11:19]}" if latest_data_time != 'N/A' else "N/A")
-
-                st.divider()
-
-                # Row 2: Result Highlight
-                if bias == "BULLISH":
-                    st.markdown(
-                        '<div style="background-color: #00AA0020; padding: 15px; border-radius: 5px; border-left: 4px solid #00AA00;">'
-                        '<span style="color: #00AA00; font-size: 24px; font-weight: bold;">▲ BULLISH</span><br>'
-                        f'<span style="font-size: 18px;">Confidence: {confidence:.2f}%</span></div>',
-                        unsafe_allow_html=True
-                    )
-                else:
-                    st.markdown(
-                        '<div style="background-color: #FF000020; padding: 15px; border-radius: 5px; border-left: 4px solid #FF0000;">'
-                        '<span style="color: #FF0000; font-size: 24px; font-weight: bold;">▼ BEARISH</span><br>'
-                        f'<span style="font-size: 18px;">Confidence: {confidence:.2f}%</span></div>',
-                        unsafe_allow_html=True
-                    )
-
-                st.divider()
-
-                # Row 3: Additional Details
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Instrument", instrument)
-                with col2:
-                    current_price = item.get('current_price', 0)
-                    st.metric("Current Price", f"${current_price:.2f}")
-                with col3:
-                    data_length = item.get('data_length', 0)
-                    st.metric("Data Points", data_length)
-                with col4:
-                    bullish_pct = analysis.get('bullish_weight', 0) * 100
-                    bearish_pct = analysis.get('bearish_weight', 0) * 100
-                    st.metric("Bull/Bear", f"{bullish_pct:.1f}% / {bearish_pct:.1f}%")
-
-                # Optional: Full JSON details
-                with st.expander("🔍 View Full Analysis Details"):
-                    st.json(result)
+
+            st.subheader(f"{instrument} - {bias} | Data: {latest_data_time[:10]}")
+
+            # Row 1: Timing Information
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**📅 Analysis Executed:**")
+                st.write(f"{analysis_time[:10]} at {analysis_time[11:19]}" if analysis_time != 'N/A' else "N/A")
+            with col2:
+                st.write("**📊 Latest Data Point:**")
+                st.write(f"{latest_data_time[:10]} at {latest_data_time[11:19]}" if latest_data_time != 'N/A' else "N/A")
+
+            st.divider()
+
+            # Row 2: Result Highlight
+            st.markdown(
+                (_BULL_HTML if bias == "BULLISH" else _BEAR_HTML).format(confidence=confidence),
+                unsafe_allow_html=True
+            )
+
+            st.divider()
+
+            # Row 3: Additional Details
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Instrument", instrument)
+            with col2:
+                current_price = item.get('current_price', 0)
+                st.metric("Current Price", f"${current_price:.2f}")
+            with col3:
+                data_length = item.get('data_length', 0)
+                st.metric("Data Points", data_length)
+            with col4:
+                bullish_pct = analysis.get('bullish_weight', 0) * 100
+                bearish_pct = analysis.get('bearish_weight', 0) * 100
+                st.metric("Bull/Bear", f"{bullish_pct:.1f}% / {bearish_pct:.1f}%")
+
+            # Optional: Full JSON details, only serialized when requested
+            if st.toggle("🔍 View Full Analysis Details", key="history_show_json"):
+                st.json(result)
 
 
 # Display results if available
@@ -494,24 +620,20 @@ if st.session_state.analysis_result:
     # Reference levels table - Updated terminology
     st.subheader("📊 Reference Levels (20)")
 
-    # Convert levels to dataframe for display
-    levels_data = []
-    for level in result['levels']:
-        distance = level['distance_percent'] if level['distance_percent'] is not None else 0.0
-
-        # Determine if level is bullish (above) or bearish (below)
-        position_type = "Bullish" if level['position'] == 'ABOVE' else "Bearish"
-        
-        levels_data.append({
-            'Level Name': level['name'].replace('_', ' ').title(),
-            'Price': f"${level['price']:.2f}",
-            'Distance (%)': f"{distance:.3f}%",
-            'Position': position_type,
-            'Depreciation': f"{level['depreciation']:.3f}",
-            'Effective Weight': f"{level['effective_weight']:.4f}"
+    # Convert levels to dataframe for display (position ABOVE = bullish level)
+    lv = pd.DataFrame(result['levels'])
+    if lv.empty:
+        levels_df = lv
+    else:
+        levels_df = pd.DataFrame({
+            'Level Name': lv['name'].str.replace('_', ' ').str.title(),
+            'Price': '$' + lv['price'].map('{:.2f}'.format),
+            'Distance (%)': lv['distance_percent'].fillna(0.0).map('{:.3f}%'.format),
+            'Position': np.where(lv['position'] == 'ABOVE', 'Bullish', 'Bearish'),
+            'Depreciation': lv['depreciation'].map('{:.3f}'.format),
+            'Effective Weight': lv['effective_weight'].map('{:.4f}'.format),
         })
 
-    levels_df = pd.DataFrame(levels_data)
     st.dataframe(levels_df, use_container_width=True, hide_index=True)
 
     st.divider()
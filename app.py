@@ -18,12 +18,18 @@ Enhanced with:
 
 import streamlit as st
 import pandas as pd
+import io
 import json
+import threading
 from datetime import datetime
 from pathlib import Path
 import traceback
+from collections import deque
+from types import MappingProxyType
 from price_cache_manager import PriceCacheManager
 from data_quality_report import DataQualityReport
+from prediction_model_v3 import PredictionEngine
+from instrument_identifier import ES_UPLOAD_RULES, instrument_from_upload_name
 
 # Configure page
 st.set_page_config(
@@ -68,11 +74,113 @@ st.markdown('<div class="main-title">📊 Financial Prediction Dashboard</div>',
 st.markdown("Analyze price data using the Reference Level Prediction System")
 st.divider()
 
+# Instrument -> timezone, shared by the sidebar cache controls and the analysis
+TIMEZONE_MAP = MappingProxyType({
+    'US100': 'America/New_York',
+    'ES': 'America/Chicago',
+    'UK100': 'Europe/London',
+    'US500': 'America/Chicago',
+})
+
+# Level source kind (text before any reason) -> (indicator, status); anything else is unavailable
+_SOURCE_STATUS = {
+    'CURRENT_DATA': ("🟢", "Current Data"),  # Green: from current CSV
+    'CACHE': ("🟡", "Cached (Validated)"),  # Yellow: from historical cache
+}
+_SOURCE_UNAVAILABLE = ("🔴", "Unavailable")  # Red: unavailable
+
+# Columns read from uploads, with explicit price types so the CSV reader doesn't infer them
+_UPLOAD_COLUMNS = ('time', 'open', 'high', 'low', 'close')
+_PRICE_DTYPES = {'open': 'float64', 'high': 'float64', 'low': 'float64', 'close': 'float64'}
+
+
+# Price cache access - reruns reuse the manager and its parsed cache file
+@st.cache_resource
+def _get_cache_mgr(instrument: str, tz: str) -> PriceCacheManager:
+    """One PriceCacheManager per (instrument, timezone) for the life of the server."""
+    return PriceCacheManager(instrument, tz)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_cache_cached(instrument: str, tz: str) -> dict:
+    """Price cache contents for an instrument, cached for 60 seconds."""
+    return _get_cache_mgr(instrument, tz).load_cache()
+
+
+@st.cache_data(show_spinner=False)
+def _read_upload(raw: bytes) -> pd.DataFrame:
+    """Parse uploaded CSV bytes once per file rather than on every rerun."""
+    # Only the time/OHLC columns are read, so extra columns (e.g. a volume column with
+    # blanks) cannot fail the typed parse; missing ones are reported by the caller
+    header = pd.read_csv(io.BytesIO(raw), nrows=0).columns
+    usecols = [c for c in _UPLOAD_COLUMNS if c in header]
+    # The Arrow reader is multithreaded and types ISO timestamps while it parses
+    return pd.read_csv(io.BytesIO(raw), engine='pyarrow', usecols=usecols,
+                       dtype={c: t for c, t in _PRICE_DTYPES.items() if c in usecols})
+
+
+@st.cache_data(show_spinner=False)
+def load_and_prepare(raw: bytes, timezone: str) -> pd.DataFrame:
+    """Uploaded CSV as a time-indexed DataFrame converted to the instrument timezone."""
+    df = _read_upload(raw)
+    # An explicit format skips per-row format inference, the slow part of datetime parsing
+    try:
+        df['time'] = pd.to_datetime(df['time'], utc=True, format='ISO8601', cache=True)
+    except ValueError:
+        df['time'] = pd.to_datetime(df['time'], utc=True, format='mixed', cache=True)
+    # The index stays tz-aware: the engine slices sessions against tz-aware bounds, and a
+    # datetime64[ns, tz] index is int64-backed, so comparisons are already vectorized
+    return df.set_index('time').tz_convert(timezone)
+
+
+@st.cache_data(show_spinner=False, max_entries=20)
+def _result_json(analysis_key: str, _result: dict) -> str:
+    """JSON export of an analysis result, serialized once per analysis run."""
+    return json.dumps(_result, indent=2, default=str)
+
+
+@st.cache_data(show_spinner=False, max_entries=20)
+def _levels_frame(analysis_key: str, _levels: list) -> pd.DataFrame:
+    """Display table of reference levels, built column-wise once per analysis run."""
+    lv = pd.DataFrame.from_records(_levels)
+    if lv.empty:
+        return lv
+    return pd.DataFrame({
+        'Level Name': lv['name'].str.replace('_', ' ').str.title(),
+        'Price': '$' + lv['price'].map('{:.2f}'.format),
+        'Distance (%)': lv['distance_percent'].fillna(0.0).map('{:.3f}%'.format),
+        'Position': lv['position'],
+        'Depreciation': lv['depreciation'].map('{:.3f}'.format),
+        'Effective Weight': lv['effective_weight'].map('{:.4f}'.format),
+    })
+
+
+@st.cache_data(show_spinner=False, max_entries=20)
+def _quality_text(instrument: str, tz: str, expected_levels: tuple, level_sources: tuple) -> str:
+    """Data quality report text, a pure function of the analysis levels and their sources."""
+    report = DataQualityReport(instrument, tz)
+    # We don't need the dataframe for this analysis
+    report.analyze_data_coverage(None, list(expected_levels), dict(level_sources))
+    return report.generate_report()
+
+
+@st.cache_resource
+def _engine(instrument: str) -> PredictionEngine:
+    """PredictionEngine for an instrument, shared across reruns and sessions."""
+    return PredictionEngine(instrument=instrument)
+
+
+@st.cache_resource
+def _engine_lock(instrument: str) -> threading.Lock:
+    """Lock serializing analyze() on the shared engine, which keeps per-run level state."""
+    return threading.Lock()
+
+
 # Initialize session state
 if 'analysis_result' not in st.session_state:
     st.session_state.analysis_result = None
 if 'analysis_history' not in st.session_state:
-    st.session_state.analysis_history = []
+    st.session_state.analysis_history = deque(maxlen=50)  # Keep the 50 most recent analyses
 
 # Sidebar configuration
 with st.sidebar:
@@ -95,14 +203,9 @@ with st.sidebar:
         help="Manage price cache for a specific instrument"
     )
 
-    timezone_map = {
-        'US100': 'America/New_York',
-        'ES': 'America/Chicago',
-        'UK100': 'Europe/London',
-    }
-
-    cache_manager = PriceCacheManager(cache_instrument, timezone_map[cache_instrument])
-    cache = cache_manager.load_cache()
+    cache_tz = TIMEZONE_MAP[cache_instrument]
+    cache_manager = _get_cache_mgr(cache_instrument, cache_tz)
+    cache = _load_cache_cached(cache_instrument, cache_tz)
     num_cached = len(cache['cached_levels'])
 
     col1, col2 = st.columns(2)
@@ -117,6 +220,7 @@ with st.sidebar:
     with col2:
         if st.button("🗑️ Clear Old", key="cleanup_cache_btn", use_container_width=True):
             removed = cache_manager.cleanup_old_cache(days_threshold=30)
+            _load_cache_cached.clear()
             st.success(f"Removed {removed} old entries")
 
     st.metric("Cached Levels", num_cached)
@@ -134,7 +238,12 @@ if analysis_mode == "Upload & Analyze":
 
     if uploaded_file is not None:
         # Load CSV
-        df = pd.read_csv(uploaded_file)
+        raw = uploaded_file.getvalue()
+        try:
+            df = _read_upload(raw)
+        except Exception as e:
+            st.error(f"❌ Could not parse CSV: {str(e)}")
+            st.stop()
 
         # Validate columns
         required_cols = ['time', 'open', 'high', 'low', 'close']
@@ -164,43 +273,22 @@ if analysis_mode == "Upload & Analyze":
             if st.button("🔍 Analyze Data", key="analyze_btn", use_container_width=True):
                 with st.spinner("Running prediction analysis..."):
                     try:
-                        # Import prediction engine
-                        from extract_and_analyze import DataExtractor
-                        from prediction_model_v3 import PredictionEngine, OutputFormatter
-
-                        # Parse time column
-                        df['time'] = pd.to_datetime(df['time'], utc=True)
-                        df.set_index('time', inplace=True)
-
                         # Identify instrument from filename
                         filename = uploaded_file.name
-                        instrument = "US100"  # Default
-
-                        if "NQ" in filename.upper():
-                            instrument = "US100"
-                        elif "ES" in filename.upper():
-                            instrument = "ES"
-                        elif "UK100" in filename.upper() or "FTSE" in filename.upper():
-                            instrument = "UK100"
-
-                        # Get timezone mapping
-                        timezone_map = {
-                            'US100': 'America/New_York',
-                            'ES': 'America/Chicago',
-                            'UK100': 'Europe/London',
-                        }
+                        instrument = instrument_from_upload_name(filename, ES_UPLOAD_RULES)  # Default US100
 
-                        timezone = timezone_map.get(instrument, 'UTC')
+                        timezone = TIMEZONE_MAP.get(instrument, 'UTC')
 
-                        # Convert timezone
-                        df.index = df.index.tz_convert(timezone)
+                        # Parse time column and convert timezone (cached per file)
+                        df = load_and_prepare(raw, timezone)
 
                         # Get latest timestamp
                         latest_timestamp = str(df.index[-1])
 
                         # Run prediction
-                        engine = PredictionEngine(instrument=instrument)
-                        result = engine.analyze(df, latest_timestamp)
+                        engine = _engine(instrument)
+                        with _engine_lock(instrument):
+                            result = engine.analyze(df, latest_timestamp)
 
                         # Store result
                         st.session_state.analysis_result = {
@@ -210,7 +298,7 @@ if analysis_mode == "Upload & Analyze":
                             'timestamp': datetime.now().isoformat(),
                             'filename': filename,
                             'data_length': len(df),
-                            'current_price': df.iloc[-1]['close']
+                            'current_price': float(df['close'].iat[-1])
                         }
 
                         # Add to history
@@ -323,38 +411,24 @@ if st.session_state.analysis_result:
     level_sources = result.get('level_sources', {})
 
     if level_sources:
-        # Create source tracking display
-        source_cols = st.columns(3)
-        with source_cols[0]:
-            st.write("**Level**")
-        with source_cols[1]:
-            st.write("**Price**")
-        with source_cols[2]:
-            st.write("**Source**")
-
+        # Build the source tracking table in one pass and render it as a single widget
+        rows = []
         for level in result['levels']:
             level_name = level['name']
             source = level_sources.get(level_name, "UNKNOWN")
 
-            # Determine color indicator
-            if "CURRENT_DATA" in source:
-                indicator = "🟢"  # Green: from current CSV
-                status = "Current Data"
-            elif "CACHE" in source:
-                indicator = "🟡"  # Yellow: from historical cache
-                status = "Cached (Validated)"
-            else:
-                indicator = "🔴"  # Red: unavailable
-                status = "Unavailable"
-
-            cols = st.columns(3)
-            with cols[0]:
-                st.write(f"{indicator} {level_name}")
-            with cols[1]:
-                st.write(f"${level['price']:.2f}" if level['price'] else "N/A")
-            with cols[2]:
-                st.write(f"**{status}**")
-                st.caption(source)
+            # Determine color indicator from the source kind, e.g. 'CACHE (reason)' -> 'CACHE'
+            indicator, status = _SOURCE_STATUS.get(source.split(' ', 1)[0], _SOURCE_UNAVAILABLE)
+
+            rows.append((
+                f"{indicator} {level_name}",
+                f"${level['price']:.2f}" if level['price'] else "N/A",
+                status,
+                source,
+            ))
+
+        sources_df = pd.DataFrame(rows, columns=['Level', 'Price', 'Status', 'Source'])
+        st.dataframe(sources_df, use_container_width=True, hide_index=True)
 
         st.caption("🟢 = From current CSV  |  🟡 = From cache (validated)  |  🔴 = Not available")
 
@@ -363,18 +437,14 @@ if st.session_state.analysis_result:
     # Data Quality Report
     st.subheader("📊 Data Quality Report")
 
-    quality_report = DataQualityReport(instrument, st.session_state.analysis_result['timezone'])
-
-    # Analyze data coverage
-    expected_levels = [l['name'] for l in result['levels']]
-    quality_report.analyze_data_coverage(
-        None,  # We don't need the dataframe for this analysis
+    # Report text is cached, so reruns skip rebuilding it
+    expected_levels = tuple(l['name'] for l in result['levels'])
+    quality_text = _quality_text(
+        instrument,
+        st.session_state.analysis_result['timezone'],
         expected_levels,
-        level_sources
+        tuple(sorted(level_sources.items()))
     )
-
-    # Display report
-    quality_text = quality_report.generate_report()
     st.text(quality_text)
 
     st.divider()
@@ -383,19 +453,7 @@ if st.session_state.analysis_result:
     st.subheader("📊 Reference Levels (20)")
 
     # Convert levels to dataframe for display
-    levels_data = []
-    for level in result['levels']:
-        distance = level['distance_percent'] if level['distance_percent'] is not None else 0.0
-        levels_data.append({
-            'Level Name': level['name'].replace('_', ' ').title(),
-            'Price': f"${level['price']:.2f}",
-            'Distance (%)': f"{distance:.3f}%",
-            'Position': level['position'],
-            'Depreciation': f"{level['depreciation']:.3f}",
-            'Effective Weight': f"{level['effective_weight']:.4f}"
-        })
-
-    levels_df = pd.DataFrame(levels_data)
+    levels_df = _levels_frame(st.session_state.analysis_result['timestamp'], result['levels'])
     st.dataframe(levels_df, use_container_width=True, hide_index=True)
 
     st.divider()
@@ -407,7 +465,7 @@ if st.session_state.analysis_result:
 
     with col1:
         # JSON export
-        json_data = json.dumps(result, indent=2, default=str)
+        json_data = _result_json(st.session_state.analysis_result['timestamp'], result)
         st.download_button(
             label="📥 Download JSON",
             data=json_data,
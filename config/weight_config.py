@@ -2,8 +2,11 @@
 Weight Configuration Manager
 Manages adjustable weights for prediction levels
 """
+import math
+import sys
 from pathlib import Path
-from typing import Dict, List, Any
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping
 import logging
 from src.infrastructure.config.file_config_store import FileConfigStore
 
@@ -82,16 +85,27 @@ class WeightConfig:
         self.store = FileConfigStore(config_path)
         self.weights = self._load_weights()
 
+    @staticmethod
+    def _intern_levels(weights: Mapping[str, float]) -> Dict[str, float]:
+        """Copy of a level -> weight mapping with interned level names"""
+        return {sys.intern(name): float(value) for name, value in weights.items()}
+
+    @classmethod
+    def _copy_defaults(cls) -> Dict[str, Dict[str, float]]:
+        """Mutable copy of the frozen default weights"""
+        return {instrument: dict(weights) for instrument, weights in cls.DEFAULT_WEIGHTS.items()}
+
     def _load_weights(self) -> Dict[str, Dict[str, float]]:
         """Load weights from config file, or create defaults if not exists"""
         loaded = self.store.load()
         if loaded:
             logger.info(f"Loaded weights from {self.config_path}")
-            return loaded
+            return {instrument: self._intern_levels(weights) for instrument, weights in loaded.items()}
 
         # Create default weights file
-        self._save_weights(self.DEFAULT_WEIGHTS.copy())
-        return self.DEFAULT_WEIGHTS.copy()
+        weights = self._copy_defaults()
+        self._save_weights(weights)
+        return weights
 
     def _save_weights(self, weights: Dict[str, Dict[str, float]]):
         """Save weights to config file"""
@@ -101,25 +115,25 @@ class WeightConfig:
         except Exception as e:
             logger.error(f"Failed to save weights: {e}")
 
-    def get_weights(self, instrument: str) -> Dict[str, float]:
-        """Get current weights for an instrument"""
+    def get_weights(self, instrument: str) -> Mapping[str, float]:
+        """Get current weights for an instrument (defaults are returned read-only)"""
         return self.weights.get(instrument, self.DEFAULT_WEIGHTS.get(instrument, {}))
 
     def set_weights(self, instrument: str, weights: Dict[str, float]):
         """Set weights for an instrument (must sum to 1.0)"""
         # Validate weights sum to approximately 1.0
-        total = sum(weights.values())
+        total = math.fsum(weights.values())
         if abs(total - 1.0) > 0.0001:
             raise ValueError(f"Weights must sum to 1.0, got {total}")
 
-        self.weights[instrument] = weights
+        self.weights[instrument] = self._intern_levels(weights)
         self._save_weights(self.weights)
         logger.info(f"Updated weights for {instrument}")
 
     def reset_instrument_weights(self, instrument: str):
         """Reset weights for an instrument to defaults"""
         if instrument in self.DEFAULT_WEIGHTS:
-            self.weights[instrument] = self.DEFAULT_WEIGHTS[instrument].copy()
+            self.weights[instrument] = dict(self.DEFAULT_WEIGHTS[instrument])
             self._save_weights(self.weights)
             logger.info(f"Reset weights for {instrument} to defaults")
         else:
@@ -127,13 +141,13 @@ class WeightConfig:
 
     def reset_all_weights(self):
         """Reset all weights to defaults"""
-        self.weights = self.DEFAULT_WEIGHTS.copy()
+        self.weights = self._copy_defaults()
         self._save_weights(self.weights)
         logger.info("Reset all weights to defaults")
 
     def validate_weights(self, weights: Dict[str, float]) -> tuple[bool, str]:
         """Validate weights (must sum to 1.0)"""
-        total = sum(weights.values())
+        total = math.fsum(weights.values())
         if abs(total - 1.0) > 0.0001:
             return False, f"Weights sum to {total:.4f}, must be 1.0"
         return True, "Weights are valid"
@@ -152,6 +166,14 @@ class WeightConfig:
 
     def import_weights(self, weights_data: Dict[str, Dict[str, float]]):
         """Import weights from external source"""
-        self.weights = weights_data.copy()
+        self.weights = {instrument: self._intern_levels(weights) for instrument, weights in weights_data.items()}
         self._save_weights(self.weights)
         logger.info("Imported weights from external source")
+
+
+# Freeze the defaults once so they can be shared without defensive copies; level names are
+# interned so lookups with names from loaded or imported weights hit the identity fast path
+WeightConfig.DEFAULT_WEIGHTS = MappingProxyType({
+    instrument: MappingProxyType(WeightConfig._intern_levels(weights))
+    for instrument, weights in WeightConfig.DEFAULT_WEIGHTS.items()
+})
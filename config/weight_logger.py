@@ -3,9 +3,14 @@ Weight Change Logger
 Logs all weight adjustments for audit trail and records
 """
 import logging
+import math
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
+
+import numpy as np
+import pandas as pd
+
 from src.infrastructure.logging.file_log_store import FileLogStore
 
 logger = logging.getLogger(__name__)
@@ -32,18 +37,20 @@ class WeightLogger:
         """
         timestamp = datetime.now()
 
-        # Identify which weights changed
-        changed_weights = {}
-        for level_name in new_weights:
-            old_value = old_weights.get(level_name, 0.0)
-            new_value = new_weights.get(level_name, 0.0)
+        # Identify which weights changed, comparing all levels in one array operation
+        level_names = list(new_weights)
+        old_arr = np.fromiter((old_weights.get(name, 0.0) for name in level_names),
+                              dtype=np.float64, count=len(level_names))
+        new_arr = np.fromiter(new_weights.values(), dtype=np.float64, count=len(level_names))
+        diff = new_arr - old_arr
 
-            if abs(old_value - new_value) > 0.00001:  # Account for floating point precision
-                changed_weights[level_name] = {
-                    'old': old_value,
-                    'new': new_value,
-                    'change': new_value - old_value
-                }
+        changed_weights = {}
+        for i in np.flatnonzero(np.abs(diff) > 0.00001):  # Account for floating point precision
+            changed_weights[level_names[i]] = {
+                'old': float(old_arr[i]),
+                'new': float(new_arr[i]),
+                'change': float(diff[i])
+            }
 
         if not changed_weights:
             logger.info(f"No weight changes detected for {instrument}")
@@ -56,8 +63,8 @@ class WeightLogger:
             'user': user or 'admin',
             'reason': reason or 'Manual adjustment',
             'changes': changed_weights,
-            'old_total': sum(old_weights.values()),
-            'new_total': sum(new_weights.values()),
+            'old_total': math.fsum(old_weights.values()),
+            'new_total': math.fsum(new_weights.values()),
             'num_changed_levels': len(changed_weights)
         }
 
@@ -91,29 +98,19 @@ class WeightLogger:
 
     def export_history_to_csv(self, output_file: Path, instrument: str = None):
         """Export weight change history to CSV"""
-        import csv
-
         history = self.get_change_history(instrument=instrument)
 
-        with open(output_file, 'w', newline='') as f:
-            writer = csv.writer(f)
-
-            # Write header
-            writer.writerow(['Timestamp', 'Instrument', 'User', 'Reason', 'Level', 'Old Weight', 'New Weight', 'Change'])
-
-            # Write rows
-            for entry in history:
-                for level_name, changes in entry['changes'].items():
-                    writer.writerow([
-                        entry['timestamp'],
-                        entry['instrument'],
-                        entry['user'],
-                        entry['reason'],
-                        level_name,
-                        f"{changes['old']:.6f}",
-                        f"{changes['new']:.6f}",
-                        f"{changes['change']:.6f}"
-                    ])
+        # One row per changed level, written in a single pass by pandas' C writer
+        rows = pd.DataFrame(
+            [
+                (entry['timestamp'], entry['instrument'], entry['user'], entry['reason'],
+                 level_name, changes['old'], changes['new'], changes['change'])
+                for entry in history
+                for level_name, changes in entry['changes'].items()
+            ],
+            columns=['Timestamp', 'Instrument', 'User', 'Reason', 'Level', 'Old Weight', 'New Weight', 'Change']
+        )
+        rows.to_csv(output_file, index=False, float_format='%.6f')
 
         logger.info(f"Exported weight change history to {output_file}")
 
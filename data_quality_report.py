@@ -8,7 +8,20 @@ the quality of prediction inputs.
 
 from datetime import datetime
 from typing import Dict, List
-import pytz
+import numpy as np
+import pandas as pd
+from zoneinfo import ZoneInfo
+
+# Level source kinds as written by the prediction engine, mapped to tally slots
+_CURRENT_DATA, _CACHE, _UNAVAILABLE = range(3)
+_SOURCE_KINDS = {'CURRENT_DATA': _CURRENT_DATA, 'CACHE': _CACHE, 'UNAVAILABLE': _UNAVAILABLE}
+
+# Levels whose absence is called out in the report
+_CRITICAL_LEVELS = ('daily_midnight', 'ny_open', '4h_open', '2h_open')
+
+# Report banner and section headers, rendered once
+_SEP = '=' * 60 + '\n'
+_SECTIONS = (('issues', '🔴 ISSUES:\n'), ('warnings', '🟡 WARNINGS:\n'), ('info', 'ℹ️ INFO:\n'))
 
 
 class DataQualityReport:
@@ -16,10 +29,21 @@ class DataQualityReport:
 
     def __init__(self, instrument: str, timezone_str: str):
         self.instrument = instrument
-        self.timezone = pytz.timezone(timezone_str)
+        self.timezone = ZoneInfo(timezone_str)
         self.issues = []
         self.warnings = []
         self.info = []
+        self._now = None
+
+    def _current_time(self) -> datetime:
+        """Report time, taken once so every check and the header agree."""
+        if self._now is None:
+            self._now = datetime.now(self.timezone)
+        return self._now
+
+    def refresh(self):
+        """Take a new report time on the next check or report."""
+        self._now = None
 
     def analyze_data_coverage(self, df, expected_levels: List[str], actual_sources: Dict[str, str]):
         """
@@ -30,8 +54,24 @@ class DataQualityReport:
             expected_levels: List of expected reference levels
             actual_sources: Dictionary mapping level names to their sources
         """
+        # Count sources in a single pass, keyed on the source kind ('CACHE (reason)' -> 'CACHE')
+        counts = [0, 0, 0]
+        for s in actual_sources.values():
+            kind = _SOURCE_KINDS.get(s.split(' ', 1)[0])
+            if kind is not None:
+                counts[kind] += 1
+                continue
+            # Untagged source strings fall back to substring checks
+            if 'CURRENT_DATA' in s:
+                counts[_CURRENT_DATA] += 1
+            if 'CACHE' in s:
+                counts[_CACHE] += 1
+            if 'UNAVAILABLE' in s:
+                counts[_UNAVAILABLE] += 1
+        current_data_count, cache_count, unavailable_count = counts
+
         total_levels = len(expected_levels)
-        sourced_levels = len([s for s in actual_sources.values() if 'UNAVAILABLE' not in s])
+        sourced_levels = len(actual_sources) - unavailable_count
         coverage_percent = (sourced_levels / total_levels * 100) if total_levels > 0 else 0
 
         self.info.append({
@@ -39,11 +79,6 @@ class DataQualityReport:
             'severity': 'info'
         })
 
-        # Count sources
-        current_data_count = sum(1 for s in actual_sources.values() if 'CURRENT_DATA' in s)
-        cache_count = sum(1 for s in actual_sources.values() if 'CACHE' in s)
-        unavailable_count = sum(1 for s in actual_sources.values() if 'UNAVAILABLE' in s)
-
         self.info.append({
             'message': f'Data Sources: {current_data_count} from current CSV, {cache_count} from cache, {unavailable_count} unavailable',
             'severity': 'info'
@@ -57,8 +92,7 @@ class DataQualityReport:
             })
 
         # Check for critical missing levels
-        critical_levels = ['daily_midnight', 'ny_open', '4h_open', '2h_open']
-        missing_critical = [level for level in critical_levels
+        missing_critical = [level for level in _CRITICAL_LEVELS
                           if actual_sources.get(level, '').startswith('UNAVAILABLE')]
         if missing_critical:
             self.warnings.append({
@@ -68,9 +102,9 @@ class DataQualityReport:
 
         # Analyze data continuity
         if df is not None and len(df) > 1:
-            time_diffs = df.index.to_series().diff()
-            expected_diff = df.index[1] - df.index[0]
-            gaps = (time_diffs != expected_diff).sum() - 1  # Subtract first NaT
+            # Compare consecutive int64 timestamps against the first interval
+            time_diffs = np.diff(df.index.asi8)
+            gaps = int(np.count_nonzero(time_diffs != time_diffs[0]))
             if gaps > 0:
                 self.warnings.append({
                     'message': f'Data has {gaps} time gaps (may indicate incomplete data)',
@@ -87,15 +121,15 @@ class DataQualityReport:
         if not cache_entries:
             return
 
-        current_time = datetime.now(self.timezone)
-
-        old_entries = []
-        for level_name, entry in cache_entries.items():
-            last_accessed = datetime.fromisoformat(entry['last_accessed'])
-            age_days = (current_time - last_accessed).days
+        # Parse every last-accessed stamp in one call and compute whole-day ages together
+        last_accessed = pd.to_datetime(
+            [entry['last_accessed'] for entry in cache_entries.values()],
+            utc=True, format='ISO8601'
+        )
+        age_days = (pd.Timestamp(self._current_time()) - last_accessed).days
 
-            if age_days > 7:
-                old_entries.append(f"{level_name} (unused for {age_days} days)")
+        old_entries = [f"{level_name} (unused for {age} days)"
+                       for level_name, age in zip(cache_entries, age_days) if age > 7]
 
         if old_entries:
             self.info.append({
@@ -113,21 +147,12 @@ class DataQualityReport:
         if df is None or len(df) == 0:
             return
 
-        latest_timestamp = df.index[-1]
-        current_time = datetime.now(self.timezone)
-
-        # Handle timezone-aware timestamps
-        if hasattr(latest_timestamp, 'tz_localize'):
-            if latest_timestamp.tz is None:
-                latest_timestamp = latest_timestamp.tz_localize(self.timezone)
-        elif not hasattr(latest_timestamp, 'tz'):
-            # Convert to timezone-aware if needed
-            try:
-                latest_timestamp = pytz.timezone(self.timezone).localize(latest_timestamp)
-            except:
-                pass
+        # Naive timestamps are taken to be in the instrument timezone
+        latest_timestamp = pd.Timestamp(df.index[-1])
+        if latest_timestamp.tzinfo is None:
+            latest_timestamp = latest_timestamp.tz_localize(self.timezone)
 
-        age_minutes = (current_time - latest_timestamp).total_seconds() / 60
+        age_minutes = (self._current_time() - latest_timestamp).total_seconds() / 60
 
         if age_minutes < 5:
             self.info.append({
@@ -152,31 +177,22 @@ class DataQualityReport:
         Returns:
             Formatted report string
         """
-        report = f"\n{'='*60}\n"
-        report += f"DATA QUALITY REPORT - {self.instrument}\n"
-        report += f"Generated: {datetime.now(self.timezone).isoformat()}\n"
-        report += f"{'='*60}\n\n"
-
-        if self.issues:
-            report += "🔴 ISSUES:\n"
-            for issue in self.issues:
-                report += f"  - {issue['message']}\n"
-            report += "\n"
-
-        if self.warnings:
-            report += "🟡 WARNINGS:\n"
-            for warning in self.warnings:
-                report += f"  - {warning['message']}\n"
-            report += "\n"
-
-        if self.info:
-            report += "ℹ️ INFO:\n"
-            for info in self.info:
-                report += f"  - {info['message']}\n"
-            report += "\n"
-
-        report += f"{'='*60}\n"
-        return report
+        parts = [
+            '\n', _SEP,
+            f"DATA QUALITY REPORT - {self.instrument}\n",
+            f"Generated: {self._current_time().isoformat()}\n",
+            _SEP, '\n',
+        ]
+
+        for attr, header in _SECTIONS:
+            entries = getattr(self, attr)
+            if entries:
+                parts.append(header)
+                parts.append('\n'.join(f"  - {entry['message']}" for entry in entries))
+                parts.append('\n\n')
+
+        parts.append(_SEP)
+        return ''.join(parts)
 
     def to_dict(self) -> Dict:
         """
@@ -187,7 +203,7 @@ class DataQualityReport:
         """
         return {
             'instrument': self.instrument,
-            'timestamp': datetime.now(self.timezone).isoformat(),
+            'timestamp': self._current_time().isoformat(),
             'issues': self.issues,
             'warnings': self.warnings,
             'info': self.info,
@@ -206,11 +222,9 @@ class DataQualityReport:
         Returns:
             Quality score label (Excellent, Good, Fair, Poor)
         """
-        if len(self.issues) > 0:
+        if self.issues:
             return 'Poor'
-        elif len(self.warnings) > 2:
+        warning_count = len(self.warnings)
+        if warning_count > 2:
             return 'Fair'
-        elif len(self.warnings) > 0:
-            return 'Good'
-        else:
-            return 'Excellent'
+        return 'Good' if warning_count else 'Excellent'
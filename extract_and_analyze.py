@@ -10,6 +10,7 @@ Usage:
 """
 
 import argparse
+import json
 import pandas as pd
 import sys
 from pathlib import Path
@@ -30,6 +31,10 @@ PREDICTION_MODEL_TIMEZONES = {
     'GER40': 'Europe/Berlin',
 }
 
+# Columns read from the CSV; anything else (volume, ticks) is skipped at parse time
+REQUIRED_COLUMNS = ('time', 'open', 'high', 'low', 'close')
+PRICE_DTYPES = {'open': 'float64', 'high': 'float64', 'low': 'float64', 'close': 'float64'}
+
 
 class DataExtractor:
     """Extract and prepare price data for prediction model"""
@@ -69,25 +74,27 @@ class DataExtractor:
         """Load CSV and parse with proper datetime handling"""
         print(f"\nLoading data from: {self.filepath}")
         
-        # Read CSV
-        self.df = pd.read_csv(self.filepath)
-        
-        # Validate required columns
-        required_cols = ['time', 'open', 'high', 'low', 'close']
-        missing = set(required_cols) - set(self.df.columns)
+        # Validate required columns from the header before parsing any rows
+        header = pd.read_csv(self.filepath, nrows=0).columns
+        missing = set(REQUIRED_COLUMNS) - set(header)
         if missing:
             raise ValueError(f"Missing required columns: {missing}")
+
+        # Read only the OHLC columns - the Arrow reader is multithreaded and types ISO
+        # timestamps while parsing
+        read_kwargs = {'usecols': list(REQUIRED_COLUMNS), 'dtype': PRICE_DTYPES}
+        try:
+            self.df = pd.read_csv(self.filepath, engine='pyarrow', **read_kwargs)
+        except ImportError:
+            self.df = pd.read_csv(self.filepath, **read_kwargs)
         
-        # Parse time column - handle UTC timestamps
-        self.df['time'] = pd.to_datetime(self.df['time'], utc=True)
-        self.df.set_index('time', inplace=True)
-        
-        # Convert to target timezone
-        self.df.index = self.df.index.tz_convert(self.timezone)
+        # Move the time column straight into the index: parse as UTC (a no-op if already
+        # typed) and convert to the target timezone in one pass, without set_index copying the frame
+        self.df.index = pd.DatetimeIndex(pd.to_datetime(self.df.pop('time'), utc=True)).tz_convert(self.timezone)
         
         print(f"✓ Loaded {len(self.df)} candles")
         print(f"✓ Date range: {self.df.index[0]} to {self.df.index[-1]}")
-        print(f"✓ Latest price: {self.df.iloc[-1]['close']:.2f}")
+        print(f"✓ Latest price: {self.df['close'].iat[-1]:.2f}")
         
         return self.df
     
@@ -190,9 +197,11 @@ def main():
         print(f"ERROR: File not found: {args.filepath}")
         sys.exit(1)
     
-    print("=" * 60)
-    print("DATA EXTRACTION FOR PREDICTION MODEL v3.0")
-    print("=" * 60)
+    print("\n".join([
+        "=" * 60,
+        "DATA EXTRACTION FOR PREDICTION MODEL v3.0",
+        "=" * 60,
+    ]))
     
     try:
         # Initialize extractor
@@ -206,27 +215,29 @@ def main():
         
         # Show data preview if requested
         if args.show_data:
-            print("\nFirst 5 candles:")
-            print(df.head())
-            print("\nLast 5 candles:")
-            print(df.tail())
+            print(f"\nFirst 5 candles:\n{df.head()}\n\nLast 5 candles:\n{df.tail()}")
         
         # Step 3: Prepare for prediction
         df_prepared, timestamp = extractor.prepare_for_prediction(args.timestamp)
         
-        print("\n" + "=" * 60)
-        print("DATA READY FOR PREDICTION MODEL")
-        print("=" * 60)
-        print(f"Instrument: {instrument}")
-        print(f"Timezone: {timezone}")
-        print(f"Candles: {len(df_prepared)}")
-        print(f"Analysis timestamp: {timestamp}")
-        print(f"Current price: {df_prepared.iloc[-1]['close']:.2f}")
+        # Each section is written with a single print call
+        print("\n".join([
+            "\n" + "=" * 60,
+            "DATA READY FOR PREDICTION MODEL",
+            "=" * 60,
+            f"Instrument: {instrument}",
+            f"Timezone: {timezone}",
+            f"Candles: {len(df_prepared)}",
+            f"Analysis timestamp: {timestamp}",
+            f"Current price: {df_prepared['close'].iat[-1]:.2f}",
+        ]))
         
         # Now pass to prediction model
-        print("\n" + "=" * 60)
-        print("PASSING TO PREDICTION MODEL...")
-        print("=" * 60)
+        print("\n".join([
+            "\n" + "=" * 60,
+            "PASSING TO PREDICTION MODEL...",
+            "=" * 60,
+        ]))
         
         # Import and run prediction model
         from prediction_model_v3 import PredictionEngine, OutputFormatter
@@ -242,19 +253,17 @@ def main():
         
         # Format and display output
         formatter = OutputFormatter()
-        console_output = formatter.to_console(result)
+        console_output = formatter.format_summary(result)
         
-        print()
-        print(console_output)
+        print(f"\n{console_output}")
         
         # Save JSON output
         output_file = f'prediction_result_{instrument}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-        json_output = formatter.to_json(result)
+        # Encode straight into the file rather than building the whole document as a string first
         with open(output_file, 'w') as f:
-            f.write(json_output)
+            json.dump(formatter.format_json(result), f, indent=2, default=str)
         
-        print()
-        print(f"✓ JSON output saved to: {output_file}")
+        print(f"\n✓ JSON output saved to: {output_file}")
         
     except Exception as e:
         print(f"\nERROR: {e}")
@@ -12,9 +12,126 @@ Supported Instruments:
 """
 
 import re
+from functools import lru_cache
 from pathlib import Path
 
 
+# Instrument patterns and their properties, checked in order of specificity
+_INSTRUMENTS = {
+    # NASDAQ-100 (US100)
+    'US100': {
+        'patterns': [r'US100', r'NQ', r'NDX', r'NASDAQ'],
+        'code': 'US100',
+        'timezone': 'America/New_York',
+        'name': 'NASDAQ-100 E-Mini Futures'
+    },
+    # S&P 500 (ES)
+    'ES': {
+        'patterns': [r'ES\b', r'\bES\b', r'SPX', r'SP500', r'S&P'],
+        'code': 'ES',
+        'timezone': 'America/Chicago',
+        'name': 'S&P 500 E-Mini Futures'
+    },
+    # FTSE 100 (UK100)
+    'UK100': {
+        'patterns': [r'UK100', r'FTSE', r'FTSE100', r'FTSE\s*100'],
+        'code': 'UK100',
+        'timezone': 'Europe/London',
+        'name': 'FTSE 100 Index'
+    },
+    # DAX (Germany)
+    'GER40': {
+        'patterns': [r'GER40', r'DAX', r'GER\s*40'],
+        'code': 'GER40',
+        'timezone': 'Europe/Berlin',
+        'name': 'DAX Index'
+    },
+}
+
+# Patterns made only of these characters are plain substrings
+_LITERAL_RE = re.compile(r'[A-Z0-9&]+')
+
+
+def _build_matchers():
+    """
+    Split each instrument's patterns into plain substring tokens and a regex for the rest.
+
+    Returns:
+        list: (code, tokens, pattern_or_None) in priority order
+    """
+    matchers = []
+    for code, info in _INSTRUMENTS.items():
+        tokens = tuple(p for p in info['patterns'] if _LITERAL_RE.fullmatch(p))
+        rest = [p for p in info['patterns'] if not _LITERAL_RE.fullmatch(p)]
+        matchers.append((code, tokens, re.compile('|'.join(rest)) if rest else None))
+    return matchers
+
+
+_MATCHERS = _build_matchers()
+_TZ_BY_CODE = {code: info['timezone'] for code, info in _INSTRUMENTS.items()}
+
+# Detailed instrument information returned by get_instrument_info
+_INSTRUMENT_INFO = {
+    'US100': {
+        'name': 'NASDAQ-100 E-Mini Futures',
+        'symbol': 'NQ',
+        'exchange': 'CME',
+        'timezone': 'America/New_York',
+        'session_open': '17:00',  # 5:00 PM ET (Sunday-Friday)
+        'session_close': '16:00',  # 4:00 PM ET
+        'description': 'Tracks the NASDAQ-100 index'
+    },
+    'ES': {
+        'name': 'S&P 500 E-Mini Futures',
+        'symbol': 'ES',
+        'exchange': 'CME',
+        'timezone': 'America/Chicago',
+        'session_open': '17:00',  # 5:00 PM CT (Sunday-Friday)
+        'session_close': '16:00',  # 4:00 PM CT
+        'description': 'Tracks the S&P 500 index'
+    },
+    'UK100': {
+        'name': 'FTSE 100 Index',
+        'symbol': 'FTSE',
+        'exchange': 'LSE',
+        'timezone': 'Europe/London',
+        'session_open': '08:00',
+        'session_close': '16:30',
+        'description': 'Tracks the FTSE 100 index'
+    },
+    'GER40': {
+        'name': 'DAX Index',
+        'symbol': 'DAX',
+        'exchange': 'Xetra',
+        'timezone': 'Europe/Berlin',
+        'session_open': '09:00',
+        'session_close': '17:30',
+        'description': 'Tracks the DAX index'
+    }
+}
+
+
+# Instrument codes accepted by validate_instrument
+_VALID_INSTRUMENTS = frozenset(('US100', 'ES', 'UK100', 'GER40'))
+
+# Dashboard upload rules: (filename tokens, instrument) checked in priority order, so an
+# NQ file is never claimed by the "ES" inside words such as "futures" or "prices".
+# Home.py labels S&P files US500.
+US500_UPLOAD_RULES = (
+    (('NQ',), 'US100'),
+    (('ES', 'SP', 'US500'), 'US500'),
+    (('UK100', 'FTSE'), 'UK100'),
+)
+
+# app.py keeps the ES code for S&P files
+ES_UPLOAD_RULES = (
+    (('NQ',), 'US100'),
+    (('ES',), 'ES'),
+    (('UK100', 'FTSE'), 'UK100'),
+)
+
+
+@lru_cache(maxsize=512)
 def identify_instrument_from_file(filepath):
     """
     Identify instrument from filename.
@@ -36,49 +153,39 @@ def identify_instrument_from_file(filepath):
     # Extract filename from path
     filename = Path(filepath).name.upper()
 
-    # Define instrument patterns and their properties
-    instruments = {
-        # NASDAQ-100 (US100)
-        'US100': {
-            'patterns': [r'US100', r'NQ', r'NDX', r'NASDAQ'],
-            'code': 'US100',
-            'timezone': 'America/New_York',
-            'name': 'NASDAQ-100 E-Mini Futures'
-        },
-        # S&P 500 (ES)
-        'ES': {
-            'patterns': [r'ES\b', r'\bES\b', r'SPX', r'SP500', r'S&P'],
-            'code': 'ES',
-            'timezone': 'America/Chicago',
-            'name': 'S&P 500 E-Mini Futures'
-        },
-        # FTSE 100 (UK100)
-        'UK100': {
-            'patterns': [r'UK100', r'FTSE', r'FTSE100', r'FTSE\s*100'],
-            'code': 'UK100',
-            'timezone': 'Europe/London',
-            'name': 'FTSE 100 Index'
-        },
-        # DAX (Germany)
-        'GER40': {
-            'patterns': [r'GER40', r'DAX', r'GER\s*40'],
-            'code': 'GER40',
-            'timezone': 'Europe/Berlin',
-            'name': 'DAX Index'
-        },
-    }
-
-    # Try to match patterns in order of specificity
-    # Check each instrument's patterns
-    for instrument_key, instrument_info in instruments.items():
-        for pattern in instrument_info['patterns']:
-            if re.search(pattern, filename):
-                return (instrument_info['code'], instrument_info['timezone'])
+    # Try each instrument in order of specificity, substring tokens before regex
+    for code, tokens, pattern in _MATCHERS:
+        if any(token in filename for token in tokens) or (pattern is not None and pattern.search(filename)):
+            return (code, _TZ_BY_CODE[code])
 
     # Default fallback
     return ('US100', 'America/New_York')
 
 
+def instrument_from_upload_name(filename, rules, default='US100'):
+    """
+    Instrument for an uploaded file from the first rule with a token in its name.
+
+    Args:
+        filename (str): Uploaded file name
+        rules (tuple): (tokens, instrument) pairs in priority order, e.g. US500_UPLOAD_RULES
+        default (str): Instrument when no token matches
+
+    Returns:
+        str: Instrument code
+
+    Examples:
+        >>> instrument_from_upload_name('futures_NQ_1m.csv', US500_UPLOAD_RULES)
+        'US100'
+    """
+
+    name = filename.upper()
+    for tokens, instrument in rules:
+        if any(token in name for token in tokens):
+            return instrument
+    return default
+
+
 def get_instrument_info(instrument_code):
     """
     Get detailed information about an instrument.
@@ -90,52 +197,17 @@ def get_instrument_info(instrument_code):
         dict: Instrument information including timezone, name, etc.
     """
 
-    instruments = {
-        'US100': {
-            'name': 'NASDAQ-100 E-Mini Futures',
-            'symbol': 'NQ',
-            'exchange': 'CME',
-            'timezone': 'America/New_York',
-            'session_open': '17:00',  # 5:00 PM ET (Sunday-Friday)
-            'session_close': '16:00',  # 4:00 PM ET
-            'description': 'Tracks the NASDAQ-100 index'
-        },
-        'ES': {
-            'name': 'S&P 500 E-Mini Futures',
-            'symbol': 'ES',
-            'exchange': 'CME',
-            'timezone': 'America/Chicago',
-            'session_open': '17:00',  # 5:00 PM CT (Sunday-Friday)
-            'session_close': '16:00',  # 4:00 PM CT
-            'description': 'Tracks the S&P 500 index'
-        },
-        'UK100': {
-            'name': 'FTSE 100 Index',
-            'symbol': 'FTSE',
-            'exchange': 'LSE',
-            'timezone': 'Europe/London',
-            'session_open': '08:00',
-            'session_close': '16:30',
-            'description': 'Tracks the FTSE 100 index'
-        },
-        'GER40': {
-            'name': 'DAX Index',
-            'symbol': 'DAX',
-            'exchange': 'Xetra',
-            'timezone': 'Europe/Berlin',
-            'session_open': '09:00',
-            'session_close': '17:30',
-            'description': 'Tracks the DAX index'
-        }
-    }
+    info = _INSTRUMENT_INFO.get(instrument_code)
+    if info is not None:
+        return dict(info)
 
-    return instruments.get(instrument_code, {
+    return {
         'name': 'Unknown Instrument',
         'symbol': instrument_code,
         'exchange': 'Unknown',
         'timezone': 'UTC',
         'description': f'Instrument: {instrument_code}'
-    })
+    }
 
 
 def validate_instrument(instrument_code):
@@ -149,8 +221,7 @@ def validate_instrument(instrument_code):
         bool: True if valid, False otherwise
     """
 
-    valid_instruments = ['US100', 'ES', 'UK100', 'GER40']
-    return instrument_code in valid_instruments
+    return instrument_code in _VALID_INSTRUMENTS
 
 
 if __name__ == '__main__':
@@ -5,6 +5,7 @@ Configure weights for prediction levels with audit logging
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import json
 from datetime import datetime
@@ -29,6 +30,135 @@ from src.di.accessors import (
     get_weight_change_history,
     get_summary_statistics
 )
+from src.di.container import get_container
+
+# Services are container singletons; look them up once per script run
+config_service = get_config_service()
+logging_service = get_logging_service()
+
+# Change history entries shown per "Show more" page
+HISTORY_PAGE_SIZE = 10
+
+# Change history fields exported to CSV, mapped to their column headers
+HISTORY_EXPORT_COLUMNS = {
+    'timestamp': 'Timestamp',
+    'user': 'User',
+    'reason': 'Reason',
+    'num_changed_levels': 'Num_Changed_Levels',
+    'old_total': 'Old_Total',
+    'new_total': 'New_Total',
+}
+
+
+def _log_tag() -> tuple:
+    """File count and newest mtime of the weight change logs, used as a cache key."""
+    log_files = list(Path(get_container().log_path).glob("*.json"))
+    return len(log_files), max((p.stat().st_mtime_ns for p in log_files), default=0)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_history(instrument: str, log_tag: tuple) -> list:
+    """Last 30 days of weight changes for an instrument, re-read only when the logs change."""
+    return get_weight_change_history(instrument=instrument, days=30)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_statistics(instrument: str, log_tag: tuple) -> dict:
+    """Adjustment statistics for an instrument, re-read only when the logs change."""
+    return get_summary_statistics(instrument)
+
+
+@st.cache_data(show_spinner=False)
+def _display_name_map(level_names: tuple) -> dict:
+    """Display labels for level names ('daily_midnight' -> 'Daily Midnight')."""
+    return {k: k.replace('_', ' ').title() for k in level_names}
+
+
+@st.cache_data(show_spinner=False, max_entries=50)
+def _weight_details_frame(new_items: tuple, old_items: tuple, labels: tuple) -> pd.DataFrame:
+    """Weight Details table for the edited weights against the saved ones."""
+    saved = dict(old_items)
+    new = np.array([weight for _, weight in new_items], dtype=np.float64)
+    old = np.array([saved.get(level_name, 0.0) for level_name, _ in new_items], dtype=np.float64)
+    return pd.DataFrame({
+        'Level': labels,
+        'Current': pd.Series(new).map('{:.6f}'.format),
+        'Previous': pd.Series(old).map('{:.6f}'.format),
+        'Change': pd.Series(new - old).map('{:+.6f}'.format),
+        'Percentage': pd.Series(new * 100).map('{:.4f}%'.format)
+    })
+
+
+def _show_more_history():
+    """Show more button callback: reveal the next page of change history."""
+    st.session_state['history_visible'] += HISTORY_PAGE_SIZE
+
+
+def _clear_log_caches():
+    """Drop cached history and statistics after logging a change."""
+    _cached_history.clear()
+    _cached_statistics.clear()
+
+
+def _reset_weights(instrument: str):
+    """Reset button callback: restore default weights before the page reruns."""
+    config_service.reset_instrument_weights(instrument)
+
+    # Update session state
+    defaults = config_service.get_weights(instrument)
+    for level_name, weight in defaults.items():
+        st.session_state[f"slider_{level_name}"] = weight
+
+    st.session_state['admin_notice'] = f"Reset {instrument} weights to defaults"
+
+
+def _normalize_weights(instrument: str):
+    """Normalize button callback: rescale the slider weights to sum to 1.0 and save them."""
+    current_weights = get_weights(instrument)
+    weight_names = list(current_weights.keys())
+
+    # Read current slider values from session state (preserving user's manual adjustments),
+    # falling back to the saved weight
+    values = np.fromiter(
+        (st.session_state.get(f"slider_{level_name}", current_weights.get(level_name, 0.0))
+         for level_name in weight_names),
+        dtype=np.float64,
+        count=len(weight_names)
+    )
+
+    # Normalize weights: scale proportionally so sum = 1.0, or fall back to an
+    # equal distribution if all weights are 0
+    total_current_weight = values.sum()
+    if total_current_weight > 0.0:
+        normalized = (values / total_current_weight).round(6)
+        # Absorb the rounding drift in the largest level so no weight can go negative
+        largest = normalized.argmax()
+        normalized[largest] = round(normalized[largest] + 1.0 - normalized.sum(), 6)
+    else:
+        normalized = np.full_like(values, 1.0 / len(values)).round(6)
+        # Absorb the rounding drift in the last level so the total is exactly 1.0
+        normalized[-1] = round(1.0 - normalized[:-1].sum(), 6)
+    normalized_weights = dict(zip(weight_names, normalized.tolist()))
+
+    # Save normalized weights
+    set_weights(instrument, normalized_weights)
+
+    # Update slider state; the script run that follows picks these up before rendering
+    for level_name, weight in normalized_weights.items():
+        st.session_state[f"slider_{level_name}"] = weight
+
+    # Log the change
+    log_weight_change(
+        instrument=instrument,
+        old_weights=current_weights,
+        new_weights=normalized_weights,
+        user="admin",
+        reason="Proportional normalization via Normalize Weights button"
+    )
+    _clear_log_caches()
+
+    st.session_state['admin_notice'] = "✅ Weights normalized and saved! Total weight now equals 1.0"
+
 
 st.markdown("# ⚙️ Admin Settings")
 st.markdown("Configure prediction model weights and view adjustment history")
@@ -51,17 +181,17 @@ with col1:
 
 with col2:
     # Quick actions
-    if st.button("🔄 Reset to Defaults", use_container_width=True):
-        config_service = get_config_service()
-        config_service.reset_instrument_weights(selected_instrument)
-        
-        # Update session state
-        defaults = config_service.get_weights(selected_instrument)
-        for level_name, weight in defaults.items():
-            st.session_state[f"slider_{level_name}"] = weight
-            
-        st.success(f"Reset {selected_instrument} weights to defaults")
-        st.rerun()
+    # Reset and Normalize run as callbacks, before the script reruns, so one run shows their result
+    st.button(
+        "🔄 Reset to Defaults",
+        use_container_width=True,
+        on_click=_reset_weights,
+        args=(selected_instrument,)
+    )
+
+notice = st.session_state.pop('admin_notice', None)
+if notice:
+    st.success(notice)
 
 st.markdown("Adjust weights for all reference levels. Weights must sum to **1.0**")
 st.divider()
@@ -69,13 +199,19 @@ st.divider()
 # Get current weights
 current_weights = get_weights(selected_instrument)
 weight_names = list(current_weights.keys())
+display_names = _display_name_map(tuple(weight_names))
 
 # CRITICAL FIX #1: Initialize session state for all sliders BEFORE rendering them
 # This ensures Streamlit properly tracks slider values across reruns
+# Each level has a coarse slider and a fine number input; whichever one was changed since the
+# last run (Reset/Normalize write the slider key) becomes the level's weight_* value
 for level_name in weight_names:
-    slider_key = f"slider_{level_name}"
-    if slider_key not in st.session_state:
-        st.session_state[slider_key] = current_weights.get(level_name, 0.0)
+    value_key, slider_key, fine_key = f"weight_{level_name}", f"slider_{level_name}", f"fine_{level_name}"
+    previous = st.session_state.get(value_key, current_weights.get(level_name, 0.0))
+    coarse = st.session_state.get(slider_key, previous)
+    fine = st.session_state.get(fine_key, previous)
+    value = fine if fine != previous else coarse
+    st.session_state[value_key] = st.session_state[slider_key] = st.session_state[fine_key] = value
 
 # Create columns for weight sliders
 col_heading, col_button = st.columns([4, 1])
@@ -84,96 +220,66 @@ with col_heading:
     st.markdown("### 🎚️ Level Weights")
 
 with col_button:
-    if st.button("⚖️ Normalize Weights", use_container_width=True, help="Adjust all weights proportionally so they sum to 1.0"):
-        # Read current slider values from session state (preserving user's manual adjustments)
-        current_slider_values = {}
-        total_current_weight = 0.0
-
-        for level_name in weight_names:
-            # Get value from session state (user modified) or fall back to saved weight
-            val = st.session_state.get(f"slider_{level_name}", current_weights.get(level_name, 0.0))
-            current_slider_values[level_name] = val
-            total_current_weight += val
-
-        # Normalize weights: scale proportionally so sum = 1.0
-        normalized_weights = {}
-
-        if total_current_weight > 0.0:
-            # Proportional scaling: preserve relative proportions while summing to 1.0
-            for level_name, current_val in current_slider_values.items():
-                normalized_weights[level_name] = round(current_val / total_current_weight, 6)
-        else:
-            # Edge case: all weights are 0, fall back to equal distribution
-            equal_weight = 1.0 / len(weight_names)
-            remaining = 1.0
-            for i, level_name in enumerate(weight_names):
-                if i == len(weight_names) - 1:
-                    normalized_weights[level_name] = round(remaining, 6)
-                else:
-                    normalized_weights[level_name] = round(equal_weight, 6)
-                    remaining -= round(equal_weight, 6)
-
-        # Save normalized weights
-        set_weights(selected_instrument, normalized_weights)
-
-        # Update session state BEFORE displaying success message
-        # This ensures sliders will reflect new values when page reruns
-        for level_name, weight in normalized_weights.items():
-            st.session_state[f"slider_{level_name}"] = weight
-
-        # Log the change
-        log_weight_change(
-            instrument=selected_instrument,
-            old_weights=current_weights,
-            new_weights=normalized_weights,
-            user="admin",
-            reason="Proportional normalization via Normalize Weights button"
-        )
-
-        st.success(f"✅ Weights normalized and saved! Total weight now equals 1.0")
-
-        # Force UI update to show normalized values in sliders
-        st.rerun()
+    st.button(
+        "⚖️ Normalize Weights",
+        use_container_width=True,
+        help="Adjust all weights proportionally so they sum to 1.0",
+        on_click=_normalize_weights,
+        args=(selected_instrument,)
+    )
 
 # Display weights in groups
-col_count = 2
-cols = st.columns(col_count)
-col_idx = 0
-
-new_weights = {}
-
-for level_name in weight_names:
-    col = cols[col_idx % col_count]
-
-    with col:
-        # CRITICAL FIX #4: Use session state value as the slider's default
-        # This ensures sliders show the most recent value (either from disk or from equalization)
-        # If user adjusted a slider, session state will have that value
-        # If equalize was clicked, session state will have the equalized value
-        session_value = st.session_state.get(f"slider_{level_name}", current_weights.get(level_name, 0.0))
+# Sliders live in a form so dragging them does not rerun the page; edits apply together on submit
+with st.form("weights_form"):
+    col_count = 2
+    cols = st.columns(col_count)
+    col_idx = 0
+
+    new_weights = {}
+
+    for level_name in weight_names:
+        col = cols[col_idx % col_count]
+
+        with col:
+            # CRITICAL FIX #4: Use session state value as the slider's default
+            # This ensures sliders show the most recent value (either from disk or from equalization)
+            # If user adjusted a slider, session state will have that value
+            # If equalize was clicked, session state will have the equalized value
+            session_value = st.session_state.get(f"slider_{level_name}", current_weights.get(level_name, 0.0))
         
-        st.markdown(f"**{level_name.replace('_', ' ').title()}**")
-
-        # CRITICAL FIX #5: Increase max_value from 0.2 to 1.0
-        # Previous constraint of 0.2 meant users couldn't allocate more than 20% to any weight
-        # With 20 levels, equal distribution is 5% (0.05)
-        # Some users might want to weight one level heavily (e.g., 0.25 or 0.40)
-        # This was artificially limiting and confusing
-        # NOTE: Validation still ensures total = 1.0, so this won't break anything
-        new_value = st.slider(
-            label=f"Weight for {level_name}",
-            min_value=0.0,
-            max_value=1.0,  # FIX: Increased from 0.2 to 1.0 for better flexibility
-            value=session_value,
-            step=0.000001,
-            label_visibility="collapsed",
-            key=f"slider_{level_name}"
-        )
+            st.markdown(f"**{display_names[level_name]}**")
+
+            # CRITICAL FIX #5: Increase max_value from 0.2 to 1.0
+            # Previous constraint of 0.2 meant users couldn't allocate more than 20% to any weight
+            # With 20 levels, equal distribution is 5% (0.05)
+            # Some users might want to weight one level heavily (e.g., 0.25 or 0.40)
+            # This was artificially limiting and confusing
+            # NOTE: Validation still ensures total = 1.0, so this won't break anything
+            # The slider moves in 0.001 steps; the number input below sets exact values
+            st.slider(
+                label=f"Weight for {level_name}",
+                min_value=0.0,
+                max_value=1.0,  # FIX: Increased from 0.2 to 1.0 for better flexibility
+                value=session_value,
+                step=0.001,
+                label_visibility="collapsed",
+                key=f"slider_{level_name}"
+            )
+
+            new_value = st.number_input(
+                label=f"Exact weight for {level_name}",
+                min_value=0.0,
+                max_value=1.0,
+                step=0.000001,
+                format="%.6f",
+                label_visibility="collapsed",
+                key=f"fine_{level_name}"
+            )
+            new_weights[level_name] = new_value
 
-        st.text(f"Current: {new_value:.6f}")
-        new_weights[level_name] = new_value
+        col_idx += 1
 
-    col_idx += 1
+    st.form_submit_button("✅ Apply Slider Changes", use_container_width=True)
 
 st.divider()
 
@@ -208,20 +314,11 @@ with col3:
 # Detailed weight list
 st.markdown("### 📋 Weight Details")
 
-weights_table_data = []
-for level_name, weight in new_weights.items():
-    old_weight = current_weights.get(level_name, 0.0)
-    change = weight - old_weight
-
-    weights_table_data.append({
-        'Level': level_name.replace('_', ' ').title(),
-        'Current': f"{weight:.6f}",
-        'Previous': f"{old_weight:.6f}",
-        'Change': f"{change:+.6f}",
-        'Percentage': f"{weight*100:.4f}%"
-    })
-
-weights_df = pd.DataFrame(weights_table_data)
+weights_df = _weight_details_frame(
+    tuple(new_weights.items()),
+    tuple(current_weights.items()),
+    tuple(display_names[level_name] for level_name in new_weights)
+)
 st.dataframe(weights_df, use_container_width=True, hide_index=True)
 
 st.divider()
@@ -235,13 +332,20 @@ with col1:
             st.error(f"❌ Cannot save: {validation_message}")
         else:
             try:
-                # Check if there are actual changes
-                has_changes = any(
-                    abs(new_weights.get(k, 0.0) - current_weights.get(k, 0.0)) > 0.00001
-                    for k in set(list(new_weights.keys()) + list(current_weights.keys()))
-                )
+                # Compare saved and edited weights in one vectorized pass
+                old_values = np.array([current_weights.get(k, 0.0) for k in weight_names])
+                new_values = np.array([new_weights.get(k, 0.0) for k in weight_names])
+                diff_mask = ~np.isclose(old_values, new_values, rtol=0.0, atol=0.00001)
+
+                if diff_mask.any():
+                    # Only the changed levels go into the audit entry
+                    changes = {
+                        k: {'old': old, 'new': new, 'change': new - old}
+                        for k, old, new, changed in zip(weight_names, old_values.tolist(),
+                                                        new_values.tolist(), diff_mask.tolist())
+                        if changed
+                    }
 
-                if has_changes:
                     # Save weights first
                     set_weights(selected_instrument, new_weights)
 
@@ -251,8 +355,10 @@ with col1:
                         old_weights=current_weights,
                         new_weights=new_weights,
                         user="admin",
-                        reason="Manual adjustment via Admin Settings"
+                        reason="Manual adjustment via Admin Settings",
+                        changes=changes
                     )
+                    _clear_log_caches()
 
                     st.success(f"✅ Weights for {selected_instrument} updated successfully!")
                     st.info("Changes logged for audit trail")
@@ -275,14 +381,47 @@ st.divider()
 # Change history
 st.markdown("## 📜 Weight Change History")
 
-change_history = get_weight_change_history(instrument=selected_instrument, days=30)
-
-if not change_history:
-    st.info(f"No weight changes recorded for {selected_instrument} in the last 30 days")
-else:
-    st.markdown(f"**Latest {len(change_history)} changes for {selected_instrument}:**")
+log_tag = _log_tag()
+change_history = _cached_history(selected_instrument, log_tag)
+
+@st.fragment
+def render_change_history(instrument: str, change_history: list):
+    """
+    Render the change history, HISTORY_PAGE_SIZE entries at a time.
+
+    Runs as a fragment, so "Show more" reruns only this section.
+    """
+    if not change_history:
+        st.info(f"No weight changes recorded for {instrument} in the last 30 days")
+        return
+
+    visible_count = st.session_state.setdefault('history_visible', HISTORY_PAGE_SIZE)
+    visible_history = change_history[:visible_count]
+
+    st.markdown(f"**Latest {len(change_history)} changes for {instrument}:**")
+
+    # Build the visible entries' change tables at once and split them per entry
+    change_rows = [
+        (idx, level_name, changes['old'], changes['new'], changes['change'])
+        for idx, entry in enumerate(visible_history)
+        for level_name, changes in entry['changes'].items()
+    ]
+    all_changes = pd.DataFrame(change_rows, columns=['idx', 'Level', 'Old', 'New', 'Change'])
+    # History can mention levels that are no longer configured
+    history_names = _display_name_map(tuple(sorted(set(all_changes['Level']))))
+    all_changes = all_changes.assign(
+        Level=all_changes['Level'].map(history_names),
+        Old=all_changes['Old'].map('{:.6f}'.format),
+        New=all_changes['New'].map('{:.6f}'.format),
+        Change=all_changes['Change'].map('{:+.6f}'.format)
+    )
+    change_tables = {
+        idx: table.drop(columns='idx')
+        for idx, table in all_changes.groupby('idx', sort=False)
+    }
+    no_changes = all_changes.drop(columns='idx').iloc[:0]
 
-    for idx, entry in enumerate(change_history):
+    for idx, entry in enumerate(visible_history):
         with st.expander(f"📝 {entry['timestamp'][:19]} - {entry['num_changed_levels']} levels modified"):
             col1, col2, col3 = st.columns(3)
 
@@ -299,24 +438,24 @@ else:
 
             # Show changed levels
             st.markdown("**Changed Levels:**")
-            change_details = []
-            for level_name, changes in entry['changes'].items():
-                change_details.append({
-                    'Level': level_name.replace('_', ' ').title(),
-                    'Old': f"{changes['old']:.6f}",
-                    'New': f"{changes['new']:.6f}",
-                    'Change': f"{changes['change']:+.6f}"
-                })
-
-            changes_df = pd.DataFrame(change_details)
-            st.dataframe(changes_df, use_container_width=True, hide_index=True)
+            st.dataframe(change_tables.get(idx, no_changes), use_container_width=True, hide_index=True)
+
+    if len(change_history) > visible_count:
+        st.button(
+            f"Show more ({len(change_history) - visible_count} older changes)",
+            on_click=_show_more_history,
+            key="history_show_more"
+        )
+
+
+render_change_history(selected_instrument, change_history)
 
 st.divider()
 
 # Statistics
 st.markdown("## 📈 Adjustment Statistics")
 
-stats = get_summary_statistics(selected_instrument)
+stats = _cached_statistics(selected_instrument, log_tag)
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -363,7 +502,6 @@ col1, col2 = st.columns(2)
 
 with col1:
     if st.button("📥 Export Current Weights (JSON)"):
-        config_service = get_config_service()
         weights_export = config_service.export_weights()
         json_str = json.dumps(weights_export, indent=2)
         st.download_button(
@@ -375,20 +513,19 @@ with col1:
 
 with col2:
     if st.button("📥 Export Change History (CSV)"):
-        # Get logging service and export history
-        logging_service = get_logging_service()
+        # Export a year of history
         history = logging_service.get_change_history(instrument=selected_instrument, days=365)
 
         if history:
-            # Convert history to CSV format
-            import io
-            csv_buffer = io.StringIO()
-            csv_buffer.write("Timestamp,User,Reason,Num_Changed_Levels,Old_Total,New_Total\n")
-
-            for entry in history:
-                csv_buffer.write(f"{entry['timestamp']},{entry.get('user', 'unknown')},{entry.get('reason', '')},{entry['num_changed_levels']},{entry['old_total']},{entry['new_total']}\n")
-
-            csv_content = csv_buffer.getvalue()
+            # Convert history to CSV in one pass (pandas also quotes commas in reasons)
+            csv_content = (
+                pd.DataFrame(history)
+                .reindex(columns=list(HISTORY_EXPORT_COLUMNS))
+                .fillna({'user': 'unknown', 'reason': ''})
+                .rename(columns=HISTORY_EXPORT_COLUMNS)
+                .to_csv(index=False)
+                .encode()
+            )
 
             st.download_button(
                 label="Download Change History CSV",
@@ -7,6 +7,7 @@ Query and view historical predictions organized by instrument
 import streamlit as st
 import pandas as pd
 from datetime import datetime
+from pathlib import Path
 
 # Configure page
 st.set_page_config(
@@ -20,6 +21,38 @@ from src.di.accessors import (
     get_prediction_count,
     get_predictions_by_instrument
 )
+from src.di.container import get_container
+
+INSTRUMENTS = ("US100", "UK100", "US500")
+
+# Flattened prediction fields used by the tables and charts
+PREDICTION_COLUMNS = [
+    'data_timestamp', 'filename', 'data_length',
+    'result.analysis.bias', 'result.analysis.confidence',
+    'result.analysis.bullish_weight', 'result.analysis.bearish_weight',
+]
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_preds(instrument: str, cache_tag: tuple) -> pd.DataFrame:
+    """
+    Prediction summary columns for an instrument, newest data first, cached until cache_tag changes.
+
+    Only PREDICTION_COLUMNS are kept, so cache hits copy a small columnar frame
+    rather than every prediction's full nested result.
+    """
+    preds = sorted(get_predictions_by_instrument(instrument),
+                   key=lambda x: x.get('data_timestamp', ''), reverse=True)
+    # Flatten to two levels deep; the rest of each result is dropped by the reindex
+    return pd.json_normalize(preds, max_level=2).reindex(columns=PREDICTION_COLUMNS)
+
+
+def _cache_tag(instrument: str, total_count: int) -> tuple:
+    """Saved-prediction count plus the newest file mtime for an instrument."""
+    pred_dir = Path(get_container().storage_path)
+    latest_mtime = max((p.stat().st_mtime for p in pred_dir.glob(f"{instrument}_*.json")), default=0)
+    return total_count, latest_mtime
+
 
 st.markdown("# 📊 Prediction History")
 st.markdown("View and analyze predictions organized by instrument")
@@ -28,6 +61,9 @@ st.divider()
 # Show total saved predictions
 total_count = get_prediction_count()
 st.info(f"📁 **Total Saved Predictions**: {total_count} files")
+
+# Load every instrument once per rerun; reruns with no new files are served from cache
+predictions = {inst: _load_preds(inst, _cache_tag(inst, total_count)) for inst in INSTRUMENTS}
 st.divider()
 
 # Sidebar filters
@@ -51,104 +87,95 @@ st.divider()
 # Create tabs for each instrument
 tab1, tab2, tab3 = st.tabs(["🇺🇸 US100 (NASDAQ)", "🇬🇧 UK100 (FTSE)", "🇺🇸 US500 (S&P 500)"])
 
-def display_instrument_predictions(tab, instrument: str, bias_list):
-    """Display all predictions for a specific instrument"""
-    with tab:
-        # Get predictions for this instrument
-        all_preds = get_predictions_by_instrument(instrument)
-
-        # Sort by data timestamp (newest first)
-        all_preds = sorted(all_preds, key=lambda x: x.get('data_timestamp', ''), reverse=True)
-
-        # Filter by bias
-        filtered_preds = [p for p in all_preds if p.get('result', {}).get('analysis', {}).get('bias') in bias_list]
-
-        if not filtered_preds:
-            st.info(f"No predictions found for {instrument}")
-            return
-
-        # Show statistics
-        st.markdown(f"## {instrument} Predictions")
-        col1, col2, col3, col4 = st.columns(4)
-
-        with col1:
-            st.metric("Total Predictions", len(filtered_preds))
-
-        with col2:
-            bullish_count = sum(1 for p in filtered_preds if p.get('result', {}).get('analysis', {}).get('bias') == 'BULLISH')
-            st.metric("Bullish", bullish_count, f"{bullish_count/len(filtered_preds)*100:.1f}%" if filtered_preds else "0%")
-
-        with col3:
-            bearish_count = sum(1 for p in filtered_preds if p.get('result', {}).get('analysis', {}).get('bias') == 'BEARISH')
-            st.metric("Bearish", bearish_count, f"{bearish_count/len(filtered_preds)*100:.1f}%" if filtered_preds else "0%")
-
-        with col4:
-            avg_confidence = sum(p.get('result', {}).get('analysis', {}).get('confidence', 0) for p in filtered_preds) / len(filtered_preds) if filtered_preds else 0
-            st.metric("Avg Confidence", f"{avg_confidence:.2f}%")
-
-        st.divider()
-
-        # Create table
-        st.markdown("### Detailed Results")
-
-        table_data = []
-        for pred in filtered_preds:
-            result = pred.get('result', {})
-            analysis = result.get('analysis', {})
-            table_data.append({
-                'Data Timestamp': pred.get('data_timestamp', 'N/A')[:19],
-                'Bias': analysis.get('bias', 'N/A'),
-                'Confidence': f"{analysis.get('confidence', 0):.2f}%",
-                'Bullish Weight': f"{analysis.get('bullish_weight', 0):.4f}",
-                'Bearish Weight': f"{analysis.get('bearish_weight', 0):.4f}",
-                'CSV File': pred.get('filename', 'N/A'),
-                'Data Points': pred.get('data_length', 0)
-            })
-
-        df = pd.DataFrame(table_data)
-        st.dataframe(df, use_container_width=True, hide_index=True)
-
-        # Chart - Bias distribution
-        col1, col2 = st.columns(2)
-
-        with col1:
-            bias_counts = {
-                'BULLISH': bullish_count,
-                'BEARISH': bearish_count
-            }
-            st.bar_chart(pd.Series(bias_counts))
-            st.caption(f"Bias Distribution for {instrument}")
-
-        with col2:
-            # Confidence trend (last 20)
-            confidence_data = [
-                {
-                    'Data Date': p.get('data_timestamp', '')[:10],
-                    'Confidence': p.get('result', {}).get('analysis', {}).get('confidence', 0)
-                }
-                for p in filtered_preds[-20:]
-            ]
-            if confidence_data:
-                conf_df = pd.DataFrame(confidence_data)
-                st.line_chart(conf_df.set_index('Data Date'))
-                st.caption(f"Confidence Trend (Last 20) for {instrument}")
-
-        st.divider()
-
-        # Export option
-        if st.button(f"📥 Export {instrument} Predictions (CSV)", key=f"export_{instrument}"):
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label=f"Download {instrument} CSV",
-                data=csv,
-                file_name=f"{instrument}_predictions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
+@st.fragment
+def display_instrument_predictions(instrument: str, frame: pd.DataFrame, bias_list):
+    """Display all predictions for a specific instrument (frame from _load_preds, newest first).
+
+    Runs as a fragment, so interacting with one instrument's table or export
+    button reruns only that instrument's section.
+    """
+    # Filter by bias
+    filtered = frame[frame['result.analysis.bias'].isin(bias_list)].reset_index(drop=True)
+
+    if filtered.empty:
+        st.info(f"No predictions found for {instrument}")
+        return
+
+    total = len(filtered)
+    bias = filtered['result.analysis.bias'].to_numpy()
+    bullish_count = int((bias == 'BULLISH').sum())
+    bearish_count = int((bias == 'BEARISH').sum())
+    confidence = filtered['result.analysis.confidence'].fillna(0)
+
+    # Show statistics
+    st.markdown(f"## {instrument} Predictions")
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Total Predictions", total)
+
+    with col2:
+        st.metric("Bullish", bullish_count, f"{bullish_count/total*100:.1f}%")
+
+    with col3:
+        st.metric("Bearish", bearish_count, f"{bearish_count/total*100:.1f}%")
+
+    with col4:
+        st.metric("Avg Confidence", f"{confidence.mean():.2f}%")
+
+    st.divider()
+
+    # Create table
+    st.markdown("### Detailed Results")
+
+    df = pd.DataFrame({
+        'Data Timestamp': filtered['data_timestamp'].fillna('N/A').str[:19],
+        'Bias': filtered['result.analysis.bias'],
+        'Confidence': confidence.map('{:.2f}%'.format),
+        'Bullish Weight': filtered['result.analysis.bullish_weight'].fillna(0).map('{:.4f}'.format),
+        'Bearish Weight': filtered['result.analysis.bearish_weight'].fillna(0).map('{:.4f}'.format),
+        'CSV File': filtered['filename'].fillna('N/A'),
+        'Data Points': filtered['data_length'].fillna(0).astype('int64')
+    })
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+    # Chart - Bias distribution
+    col1, col2 = st.columns(2)
+
+    with col1:
+        bias_counts = {
+            'BULLISH': bullish_count,
+            'BEARISH': bearish_count
+        }
+        st.bar_chart(pd.Series(bias_counts))
+        st.caption(f"Bias Distribution for {instrument}")
+
+    with col2:
+        # Confidence trend (last 20)
+        recent = filtered.tail(20)
+        conf_df = pd.DataFrame({
+            'Data Date': recent['data_timestamp'].fillna('').str[:10],
+            'Confidence': confidence.tail(20)
+        })
+        st.line_chart(conf_df.set_index('Data Date'))
+        st.caption(f"Confidence Trend (Last 20) for {instrument}")
+
+    st.divider()
+
+    # Export option
+    if st.button(f"📥 Export {instrument} Predictions (CSV)", key=f"export_{instrument}"):
+        csv = df.to_csv(index=False)
+        st.download_button(
+            label=f"Download {instrument} CSV",
+            data=csv,
+            file_name=f"{instrument}_predictions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
 
 # Display each instrument
-display_instrument_predictions(tab1, "US100", bias_filter)
-display_instrument_predictions(tab2, "UK100", bias_filter)
-display_instrument_predictions(tab3, "US500", bias_filter)
+for tab, instrument in zip((tab1, tab2, tab3), INSTRUMENTS):
+    with tab:
+        display_instrument_predictions(instrument, predictions[instrument], bias_filter)
 
 st.divider()
 
@@ -10,146 +10,200 @@ Outputs: directional bias, confidence score, weight distribution, and detailed l
 Enhanced with price cache manager for historical data gap remediation.
 """
 
+import csv
+import io
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 import pytz
-from typing import Dict, List, Tuple, Any
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, NamedTuple, Tuple, Any
 from price_cache_manager import PriceCacheManager
 
 
-class ReferenceLevel:
-    """Represents a single reference level with metadata and calculations."""
-
-    def __init__(self, name: str, base_weight: float, level_type: str = "ALWAYS_AVAILABLE",
-                 availability_time: str = None):
-        self.name = name
-        self.base_weight = base_weight
-        self.level_type = level_type
-        self.availability_time = availability_time
-        self.price = None
-        self.normalized_weight = None
-        self.effective_weight = None
-        self.direction = None
-        self.position = None
-        self.distance_percent = None
-        self.depreciation = 1.0
-
-    def calculate_direction(self, current_price: float) -> str:
-        """Determine if price is above, below, or at the level."""
-        if self.price is None:
-            return "UNAVAILABLE"
-
-        threshold = abs(self.price) * 0.0001  # 0.01% threshold for floating point
-        if current_price > self.price + threshold:
-            return "BULLISH"
-        elif current_price < self.price - threshold:
-            return "BEARISH"
-        else:
-            return "NEUTRAL"
-
-    def calculate_distance(self, current_price: float) -> float:
-        """Calculate distance as percentage of current price."""
-        if self.price is None or current_price == 0:
-            return 0.0
-        return abs((current_price - self.price) / current_price) * 100
-
-    def apply_depreciation(self, distance_percent: float):
-        """Apply distance-based depreciation: 1.0 at 0%, declining to 0.1 at 5%+"""
-        if distance_percent <= 0:
-            self.depreciation = 1.0
-        elif distance_percent >= 5.0:
-            self.depreciation = 0.1
-        else:
-            # Linear decay from 1.0 to 0.1 between 0% and 5%
-            self.depreciation = 1.0 - (distance_percent / 5.0) * 0.9
-
-    def to_dict(self) -> Dict:
-        """Convert level to dictionary for output."""
-        return {
-            'name': self.name,
-            'type': self.level_type,
-            'price': round(self.price, 2) if self.price else None,
-            'position': self.position,
-            'distance_percent': round(self.distance_percent, 3) if self.distance_percent else None,
-            'base_weight': round(self.base_weight, 4),
-            'normalized_weight': round(self.normalized_weight, 4) if self.normalized_weight else None,
-            'depreciation': round(self.depreciation, 3),
-            'effective_weight': round(self.effective_weight, 4) if self.effective_weight else None,
-            'direction': self.direction
-        }
+# Reference level specification: one row per level, held as a structured array so the
+# engine works on whole columns (base weights, types, availability hours) at once
+LEVEL_DTYPE = np.dtype([
+    ('name', 'U24'),
+    ('base_weight', 'f8'),
+    ('level_type', 'U16'),         # ALWAYS_AVAILABLE or CONDITIONAL
+    ('availability_hour', 'i8'),   # Hour (instrument timezone) a CONDITIONAL level becomes available
+])
+
+# Session clock times (instrument/exchange local time)
+_T_MIDNIGHT = time(0, 0)
+_T_0830 = time(8, 30)
+_T_1700 = time(17, 0)
+_T_2000 = time(20, 0)
+
+# Direction codes used in the level arrays
+BEARISH, NEUTRAL, BULLISH = -1, 0, 1
+DIRECTION_NAMES = np.array(['BEARISH', 'NEUTRAL', 'BULLISH'])  # indexed by code + 1
+POSITION_NAMES = np.array(['ABOVE', 'AT', 'BELOW'])            # price is below a bullish level
+
+# Per-level output record: key order, then the rounding of the numeric columns (price,
+# distance_percent, base/normalized weight, depreciation, effective weight) and which of
+# them are reported as None when zero
+LEVEL_KEYS = ('name', 'type', 'price', 'position', 'distance_percent', 'base_weight',
+              'normalized_weight', 'depreciation', 'effective_weight', 'direction')
+LEVEL_DECIMALS = (2, 3, 4, 4, 3, 4)
+LEVEL_OPTIONAL = np.array([True, True, False, True, False, True])[:, None]
+
+
+class LevelTemplate(NamedTuple):
+    """Read-only per-instrument level columns shared by every engine for that instrument."""
+    names: Tuple[str, ...]
+    level_types: np.ndarray
+    base_weights: np.ndarray
+    always_available: np.ndarray
+    availability_hours: np.ndarray
+
+
+class LevelScores(NamedTuple):
+    """Per-level arrays and aggregate bias computed by score_levels."""
+    normalized: np.ndarray
+    distances: np.ndarray
+    depreciations: np.ndarray
+    effective: np.ndarray
+    directions: np.ndarray
+    bullish_weight: float
+    bearish_weight: float
+    bias: str
+    confidence: float
+
+
+def score_levels(prices: np.ndarray, base_weights: np.ndarray, current_price: float) -> LevelScores:
+    """
+    Weight the available levels and aggregate them into a bias.
+
+    One array pass per quantity over the (at most 20) levels: normalized weight, distance,
+    depreciation, effective weight and direction, then the masked bullish/bearish sums
+    and confidence.
+
+    Args:
+        prices: Level prices
+        base_weights: Base weights of the same levels
+        current_price: Latest close
+
+    Returns:
+        LevelScores with the per-level arrays, weight totals, bias and confidence
+    """
+    # Normalize weights to sum to 1.0000
+    total_base_weight = base_weights.sum()
+    if total_base_weight == 0:
+        normalized = np.zeros_like(base_weights)
+    else:
+        normalized = base_weights * (1.0 / total_base_weight)
+
+    # Distance as percentage of current price
+    if current_price == 0:
+        distances = np.zeros(len(prices))
+    else:
+        distances = np.abs((current_price - prices) / current_price) * 100
+
+    # Depreciation: 1.0 at 0%, declining linearly to 0.1 at 5%+
+    depreciations = np.where(distances >= 5.0, 0.1, 1.0 - (distances / 5.0) * 0.9)
+    effective = normalized * depreciations
+
+    # Direction (BULLISH if price > level, BEARISH if price < level) with a 0.01% threshold
+    thresholds = np.abs(prices) * 0.0001
+    directions = np.select([current_price > prices + thresholds, current_price < prices - thresholds],
+                           [BULLISH, BEARISH], NEUTRAL)
+
+    # Directional bias (binary: BULLISH or BEARISH)
+    bullish_weight = effective[directions == BULLISH].sum()
+    bearish_weight = effective[directions == BEARISH].sum()
+    bias = 'BULLISH' if bullish_weight >= bearish_weight else 'BEARISH'
+
+    # Confidence (0-100%)
+    total_weight = bullish_weight + bearish_weight
+    max_weight = max(bullish_weight, bearish_weight) if total_weight > 0 else 0
+    confidence = (max_weight / total_weight * 100) if total_weight > 0 else 0
+
+    return LevelScores(normalized, distances, depreciations, effective, directions,
+                       bullish_weight, bearish_weight, bias, confidence)
 
 
 class PredictionEngine:
     """Main prediction engine implementing the reference level analytical system."""
 
+    # Default timezone per instrument
+    _TZ_MAP = {
+        'US100': 'America/New_York',
+        'ES': 'America/Chicago',
+        'UK100': 'Europe/London',
+        'GER40': 'Europe/Berlin'
+    }
+
     # US100 level specifications
-    US100_LEVELS = [
+    US100_LEVELS = np.array([
         # Always-available levels (14 total)
-        ReferenceLevel('daily_midnight', 0.1339),
-        ReferenceLevel('previous_hourly', 0.0822),
-        ReferenceLevel('2h_open', 0.0520),
-        ReferenceLevel('4h_open', 0.0650),
-        ReferenceLevel('ny_open', 0.0779),
-        ReferenceLevel('ny_preopen', 0.0391),
-        ReferenceLevel('prev_day_high', 0.0260),
-        ReferenceLevel('prev_day_low', 0.0260),
-        ReferenceLevel('weekly_open', 0.0650),
-        ReferenceLevel('weekly_high', 0.0260),
-        ReferenceLevel('weekly_low', 0.0260),
-        ReferenceLevel('prev_week_high', 0.0520),
-        ReferenceLevel('prev_week_low', 0.0520),
-        ReferenceLevel('monthly_open', 0.0391),
+        ('daily_midnight', 0.1339, 'ALWAYS_AVAILABLE', 0),
+        ('previous_hourly', 0.0822, 'ALWAYS_AVAILABLE', 0),
+        ('2h_open', 0.0520, 'ALWAYS_AVAILABLE', 0),
+        ('4h_open', 0.0650, 'ALWAYS_AVAILABLE', 0),
+        ('ny_open', 0.0779, 'ALWAYS_AVAILABLE', 0),
+        ('ny_preopen', 0.0391, 'ALWAYS_AVAILABLE', 0),
+        ('prev_day_high', 0.0260, 'ALWAYS_AVAILABLE', 0),
+        ('prev_day_low', 0.0260, 'ALWAYS_AVAILABLE', 0),
+        ('weekly_open', 0.0650, 'ALWAYS_AVAILABLE', 0),
+        ('weekly_high', 0.0260, 'ALWAYS_AVAILABLE', 0),
+        ('weekly_low', 0.0260, 'ALWAYS_AVAILABLE', 0),
+        ('prev_week_high', 0.0520, 'ALWAYS_AVAILABLE', 0),
+        ('prev_week_low', 0.0520, 'ALWAYS_AVAILABLE', 0),
+        ('monthly_open', 0.0391, 'ALWAYS_AVAILABLE', 0),
         # Conditional levels (6 total)
-        ReferenceLevel('asian_range_high', 0.0279, 'CONDITIONAL', '00:00'),
-        ReferenceLevel('asian_range_low', 0.0279, 'CONDITIONAL', '00:00'),
-        ReferenceLevel('london_range_high', 0.0520, 'CONDITIONAL', '11:00'),
-        ReferenceLevel('london_range_low', 0.0520, 'CONDITIONAL', '11:00'),
-        ReferenceLevel('ny_range_high', 0.0391, 'CONDITIONAL', '14:00'),
-        ReferenceLevel('ny_range_low', 0.0391, 'CONDITIONAL', '14:00'),
-    ]
+        ('asian_range_high', 0.0279, 'CONDITIONAL', 0),
+        ('asian_range_low', 0.0279, 'CONDITIONAL', 0),
+        ('london_range_high', 0.0520, 'CONDITIONAL', 11),
+        ('london_range_low', 0.0520, 'CONDITIONAL', 11),
+        ('ny_range_high', 0.0391, 'CONDITIONAL', 14),
+        ('ny_range_low', 0.0391, 'CONDITIONAL', 14),
+    ], dtype=LEVEL_DTYPE)
 
     # ES has identical structure to US100
-    ES_LEVELS = [
-        ReferenceLevel('daily_midnight', 0.1339),
-        ReferenceLevel('previous_hourly', 0.0822),
-        ReferenceLevel('2h_open', 0.0520),
-        ReferenceLevel('4h_open', 0.0650),
-        ReferenceLevel('chicago_open', 0.0779),  # Different from NY
-        ReferenceLevel('chicago_preopen', 0.0391),  # Different from NY
-        ReferenceLevel('prev_day_high', 0.0260),
-        ReferenceLevel('prev_day_low', 0.0260),
-        ReferenceLevel('weekly_open', 0.0650),
-        ReferenceLevel('weekly_high', 0.0260),
-        ReferenceLevel('weekly_low', 0.0260),
-        ReferenceLevel('prev_week_high', 0.0520),
-        ReferenceLevel('prev_week_low', 0.0520),
-        ReferenceLevel('monthly_open', 0.0391),
-        ReferenceLevel('asian_range_high', 0.0279, 'CONDITIONAL', '00:00'),
-        ReferenceLevel('asian_range_low', 0.0279, 'CONDITIONAL', '00:00'),
-        ReferenceLevel('london_range_high', 0.0520, 'CONDITIONAL', '11:00'),
-        ReferenceLevel('london_range_low', 0.0520, 'CONDITIONAL', '11:00'),
-        ReferenceLevel('chicago_range_high', 0.0391, 'CONDITIONAL', '14:00'),
-        ReferenceLevel('chicago_range_low', 0.0391, 'CONDITIONAL', '14:00'),
-    ]
+    ES_LEVELS = np.array([
+        ('daily_midnight', 0.1339, 'ALWAYS_AVAILABLE', 0),
+        ('previous_hourly', 0.0822, 'ALWAYS_AVAILABLE', 0),
+        ('2h_open', 0.0520, 'ALWAYS_AVAILABLE', 0),
+        ('4h_open', 0.0650, 'ALWAYS_AVAILABLE', 0),
+        ('chicago_open', 0.0779, 'ALWAYS_AVAILABLE', 0),  # Different from NY
+        ('chicago_preopen', 0.0391, 'ALWAYS_AVAILABLE', 0),  # Different from NY
+        ('prev_day_high', 0.0260, 'ALWAYS_AVAILABLE', 0),
+        ('prev_day_low', 0.0260, 'ALWAYS_AVAILABLE', 0),
+        ('weekly_open', 0.0650, 'ALWAYS_AVAILABLE', 0),
+        ('weekly_high', 0.0260, 'ALWAYS_AVAILABLE', 0),
+        ('weekly_low', 0.0260, 'ALWAYS_AVAILABLE', 0),
+        ('prev_week_high', 0.0520, 'ALWAYS_AVAILABLE', 0),
+        ('prev_week_low', 0.0520, 'ALWAYS_AVAILABLE', 0),
+        ('monthly_open', 0.0391, 'ALWAYS_AVAILABLE', 0),
+        ('asian_range_high', 0.0279, 'CONDITIONAL', 0),
+        ('asian_range_low', 0.0279, 'CONDITIONAL', 0),
+        ('london_range_high', 0.0520, 'CONDITIONAL', 11),
+        ('london_range_low', 0.0520, 'CONDITIONAL', 11),
+        ('chicago_range_high', 0.0391, 'CONDITIONAL', 14),
+        ('chicago_range_low', 0.0391, 'CONDITIONAL', 14),
+    ], dtype=LEVEL_DTYPE)
 
     # UK100 has 15 levels (all always-available)
-    UK100_LEVELS = [
-        ReferenceLevel('daily_midnight', 0.1339),
-        ReferenceLevel('previous_hourly', 0.0822),
-        ReferenceLevel('2h_open', 0.0520),
-        ReferenceLevel('4h_open', 0.0650),
-        ReferenceLevel('london_open', 0.0779),
-        ReferenceLevel('prev_day_high', 0.0260),
-        ReferenceLevel('prev_day_low', 0.0260),
-        ReferenceLevel('weekly_open', 0.0650),
-        ReferenceLevel('weekly_high', 0.0260),
-        ReferenceLevel('weekly_low', 0.0260),
-        ReferenceLevel('prev_week_high', 0.0520),
-        ReferenceLevel('prev_week_low', 0.0520),
-        ReferenceLevel('monthly_open', 0.0391),
-        ReferenceLevel('london_range_high', 0.0520),
-        ReferenceLevel('london_range_low', 0.0520),
-    ]
+    UK100_LEVELS = np.array([
+        ('daily_midnight', 0.1339, 'ALWAYS_AVAILABLE', 0),
+        ('previous_hourly', 0.0822, 'ALWAYS_AVAILABLE', 0),
+        ('2h_open', 0.0520, 'ALWAYS_AVAILABLE', 0),
+        ('4h_open', 0.0650, 'ALWAYS_AVAILABLE', 0),
+        ('london_open', 0.0779, 'ALWAYS_AVAILABLE', 0),
+        ('prev_day_high', 0.0260, 'ALWAYS_AVAILABLE', 0),
+        ('prev_day_low', 0.0260, 'ALWAYS_AVAILABLE', 0),
+        ('weekly_open', 0.0650, 'ALWAYS_AVAILABLE', 0),
+        ('weekly_high', 0.0260, 'ALWAYS_AVAILABLE', 0),
+        ('weekly_low', 0.0260, 'ALWAYS_AVAILABLE', 0),
+        ('prev_week_high', 0.0520, 'ALWAYS_AVAILABLE', 0),
+        ('prev_week_low', 0.0520, 'ALWAYS_AVAILABLE', 0),
+        ('monthly_open', 0.0391, 'ALWAYS_AVAILABLE', 0),
+        ('london_range_high', 0.0520, 'ALWAYS_AVAILABLE', 0),
+        ('london_range_low', 0.0520, 'ALWAYS_AVAILABLE', 0),
+    ], dtype=LEVEL_DTYPE)
 
     def __init__(self, instrument: str = 'US100', timezone: str = None):
         """Initialize the prediction engine for a specific instrument.
@@ -161,65 +215,136 @@ class PredictionEngine:
         self.instrument = instrument
 
         # Set timezone based on instrument
-        timezone_map = {
-            'US100': 'America/New_York',
-            'ES': 'America/Chicago',
-            'UK100': 'Europe/London',
-            'GER40': 'Europe/Berlin'
-        }
-        self.timezone = timezone or timezone_map.get(instrument, 'America/New_York')
-        self.tz = pytz.timezone(self.timezone)
+        self.timezone = timezone or self._TZ_MAP.get(instrument, 'America/New_York')
+        self.tz = self._tz(self.timezone)
 
         # Initialize cache manager for historical data gap remediation
         self.cache_manager = PriceCacheManager(instrument, self.timezone)
 
-        # Select level configuration
-        if instrument == 'US100':
-            self.levels = [self._copy_level(l) for l in self.US100_LEVELS]
-        elif instrument == 'ES':
-            self.levels = [self._copy_level(l) for l in self.ES_LEVELS]
-        elif instrument == 'UK100':
-            self.levels = [self._copy_level(l) for l in self.UK100_LEVELS]
-        else:
-            # Default to US100 for unknown instruments
-            self.levels = [self._copy_level(l) for l in self.US100_LEVELS]
+        # Level configuration; per-run values are kept in local arrays so a shared
+        # engine holds no state between analyses
+        self.template = self._get_template(instrument)
 
         # Track source of each level (CURRENT_DATA, CACHE, or UNAVAILABLE)
         self.level_sources = {}
 
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _get_template(cls, instrument: str) -> LevelTemplate:
+        """Level columns for an instrument (US100 for unknown instruments), built once per instrument."""
+        levels = {'ES': cls.ES_LEVELS, 'UK100': cls.UK100_LEVELS}.get(instrument, cls.US100_LEVELS)
+        columns = [levels['level_type'].copy(), levels['base_weight'].copy(),
+                   levels['level_type'] == 'ALWAYS_AVAILABLE', levels['availability_hour'].copy()]
+        for column in columns:
+            column.flags.writeable = False
+        return LevelTemplate(tuple(levels['name'].tolist()), *columns)
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _tz(name: str):
+        """pytz timezone for a name, looked up once per name."""
+        return pytz.timezone(name)
+
     @staticmethod
-    def _copy_level(level: ReferenceLevel) -> ReferenceLevel:
-        """Create a fresh copy of a level template."""
-        return ReferenceLevel(level.name, level.base_weight, level.level_type, level.availability_time)
+    @lru_cache(maxsize=8)
+    def _compute_session_bounds(timezone: str, current_date: date, unit: str = 'ns') -> Dict[str, int]:
+        """
+        Window boundaries for a trading day in a timezone, built once per (timezone, day, unit).
+
+        Boundaries are integer ticks of unit since the epoch (UTC), i.e. directly comparable
+        with DatetimeIndex.asi8 of a tz-aware index of that unit; they are rounded up so
+        tick >= bound matches timestamp >= boundary. Intraday boundaries are wall-clock
+        offsets from local midnight (what today_start.replace(hour=...) gives), so only the
+        day, month, Asian range and Chicago session/preopen starts need a pytz localize.
+        The chicago_* keys are meant for the America/Chicago bounds. Callers must not
+        modify the returned dict.
+        """
+        tz = PredictionEngine._tz(timezone)
+        today_start = tz.localize(datetime.combine(current_date, _T_MIDNIGHT))
+        week_start = today_start - timedelta(days=current_date.weekday())
+
+        # Asian range starts 20:00 the previous day
+        asian_open = datetime.combine(current_date - timedelta(days=1), _T_2000)
+        try:
+            asian_start = tz.localize(asian_open)
+        except:
+            # Handle ambiguous times during DST transitions
+            asian_start = tz.localize(asian_open, is_dst=False)
+
+        # ES (Chicago) opens at 8:30 AM CT; its preopen starts 5 PM CT the previous day
+        chicago_open = tz.localize(datetime.combine(current_date, _T_0830))
+        chicago_preopen = tz.localize(datetime.combine(current_date, _T_1700)) - timedelta(days=1)
+
+        bounds = {
+            'today_start': today_start,
+            'yesterday_start': today_start - timedelta(days=1),
+            'week_start': week_start,
+            'prev_week_start': week_start - timedelta(days=7),
+            'month_start': tz.localize(datetime(current_date.year, current_date.month, 1)),
+            'asian_start': asian_start,
+            'london_start': today_start + timedelta(hours=3),
+            'london_end': today_start + timedelta(hours=11),
+            'london_open': today_start + timedelta(hours=8),
+            'ny_preopen': today_start + timedelta(hours=4),
+            'ny_open': today_start + timedelta(hours=9, minutes=30),
+            'ny_range_end': today_start + timedelta(hours=14),
+            'ny_close': today_start + timedelta(hours=16),
+            'chicago_open': chicago_open,
+            'chicago_close': chicago_open + timedelta(hours=7),  # 15:30 at the 8:30 offset
+            'chicago_preopen': chicago_preopen,
+            'chicago_range_start': today_start + timedelta(hours=8, minutes=30),
+            'chicago_range_end': today_start + timedelta(hours=14),
+        }
+
+        ns_per_tick = int(np.timedelta64(1, unit) // np.timedelta64(1, 'ns'))
+        return {name: -(-pd.Timestamp(bound).value // ns_per_tick) for name, bound in bounds.items()}
 
-    def _calculate_levels(self, df: pd.DataFrame) -> Dict[str, Any]:
+    @classmethod
+    def _chicago_bounds(cls, current_time: datetime, unit: str) -> Dict[str, int]:
+        """Session bounds for the Chicago trading day containing current_time."""
+        chicago_date = current_time.astimezone(cls._tz('America/Chicago')).date()
+        return cls._compute_session_bounds('America/Chicago', chicago_date, unit)
+
+    @staticmethod
+    def _window(ticks: np.ndarray, start: int, end: int = None) -> Tuple[int, int]:
+        """Positional [lo, hi) bounds of the rows with start <= tick < end in sorted index ticks."""
+        lo = int(ticks.searchsorted(start, side='left'))
+        hi = len(ticks) if end is None else int(ticks.searchsorted(end, side='left'))
+        return lo, max(lo, hi)
+
+    def _to_instrument_tz(self, ts):
+        """Localize a naive timestamp to, or convert an aware one into, the instrument timezone."""
+        if ts.tzinfo is None:
+            return self.tz.localize(ts)
+        return ts.astimezone(self.tz)
+
+    def _calculate_levels(self, df: pd.DataFrame, current_time, ticks: np.ndarray) -> Dict[str, Any]:
         """
         Calculate all reference level prices from OHLC data.
         Uses cache as fallback when current data doesn't contain required time periods.
-        """
-        # Convert index to instrument timezone if needed
-        current_time = df.index[-1]
-        if current_time.tzinfo is None:
-            current_time = self.tz.localize(current_time)
-        else:
-            current_time = current_time.astimezone(self.tz)
 
-        # Extract OHLC data
-        opens = df['open']
-        highs = df['high']
-        lows = df['low']
-        closes = df['close']
+        Args:
+            df: OHLC data with a time-sorted DatetimeIndex
+            current_time: Time of the last bar, in the instrument timezone
+            ticks: df.index as sorted int64 ticks since the epoch (DatetimeIndex.asi8)
+        """
+        # Extract OHLC data as raw arrays; every time window below is a [lo, hi) slice of
+        # these found by bisecting the (sorted) index ticks rather than a boolean mask over the frame
+        unit = df.index.unit
+        opens = df['open'].to_numpy()
+        highs = df['high'].to_numpy()
+        lows = df['low'].to_numpy()
 
         # Calculate base levels
         levels_dict = {}
 
         # Daily levels
-        current_date = current_time.date()
-        today_start = self.tz.localize(datetime.combine(current_date, datetime.min.time()))
-        today_data = df[df.index >= today_start]
+        bounds = self._compute_session_bounds(self.timezone, current_time.date(), unit)
+        today_start = bounds['today_start']
+        today_lo, today_hi = self._window(ticks, today_start)
 
-        if len(today_data) > 0:
-            levels_dict['daily_midnight'] = today_data['open'].iloc[0]
+        if today_lo < today_hi:
+            levels_dict['daily_midnight'] = opens[today_lo]
             self.level_sources['daily_midnight'] = 'CURRENT_DATA'
         else:
             # Try cache as fallback
@@ -228,12 +353,12 @@ class PredictionEngine:
                 levels_dict['daily_midnight'] = cached_price
                 self.level_sources['daily_midnight'] = f'CACHE ({reason})'
             else:
-                levels_dict['daily_midnight'] = opens.iloc[-1]
+                levels_dict['daily_midnight'] = opens[-1]
                 self.level_sources['daily_midnight'] = f'UNAVAILABLE ({reason})'
 
         # Previous hourly open
         if len(opens) > 1:
-            levels_dict['previous_hourly'] = opens.iloc[-2]
+            levels_dict['previous_hourly'] = opens[-2]
             self.level_sources['previous_hourly'] = 'CURRENT_DATA'
         else:
             # Try cache as fallback
@@ -242,12 +367,12 @@ class PredictionEngine:
                 levels_dict['previous_hourly'] = cached_price
                 self.level_sources['previous_hourly'] = f'CACHE ({reason})'
             else:
-                levels_dict['previous_hourly'] = opens.iloc[-1]
+                levels_dict['previous_hourly'] = opens[-1]
                 self.level_sources['previous_hourly'] = f'UNAVAILABLE ({reason})'
 
         # 2-hour open
         if len(opens) > 120:
-            levels_dict['2h_open'] = opens.iloc[-120]
+            levels_dict['2h_open'] = opens[-120]
             self.level_sources['2h_open'] = 'CURRENT_DATA'
         else:
             # Try cache as fallback
@@ -256,12 +381,12 @@ class PredictionEngine:
                 levels_dict['2h_open'] = cached_price
                 self.level_sources['2h_open'] = f'CACHE ({reason})'
             else:
-                levels_dict['2h_open'] = opens.iloc[0]
+                levels_dict['2h_open'] = opens[0]
                 self.level_sources['2h_open'] = f'UNAVAILABLE ({reason})'
 
         # 4-hour open
         if len(opens) > 240:
-            levels_dict['4h_open'] = opens.iloc[-240]
+            levels_dict['4h_open'] = opens[-240]
             self.level_sources['4h_open'] = 'CURRENT_DATA'
         else:
             # Try cache as fallback
@@ -270,20 +395,19 @@ class PredictionEngine:
                 levels_dict['4h_open'] = cached_price
                 self.level_sources['4h_open'] = f'CACHE ({reason})'
             else:
-                levels_dict['4h_open'] = opens.iloc[0]
+                levels_dict['4h_open'] = opens[0]
                 self.level_sources['4h_open'] = f'UNAVAILABLE ({reason})'
 
         # NY/London/Chicago opens (9:30 AM ET for US100, 8:30 AM CT for ES)
         if self.instrument in ['US100', 'ES']:
             if self.instrument == 'US100':
                 # NY market opens at 9:30 AM ET
-                session_start = today_start.replace(hour=9, minute=30)
-                preopen_start = today_start.replace(hour=4)  # Pre-market starts at 4 AM ET
-                session_data = df[(df.index >= session_start) & (df.index < today_start.replace(hour=16))]
-                preopen_data = df[(df.index >= preopen_start) & (df.index < session_start)]
+                # Pre-market starts at 4 AM ET, the session runs to 4 PM ET
+                session_lo, session_hi = self._window(ticks, bounds['ny_open'], bounds['ny_close'])
+                preopen_lo, preopen_hi = self._window(ticks, bounds['ny_preopen'], bounds['ny_open'])
 
-                if len(session_data) > 0:
-                    levels_dict['ny_open'] = session_data['open'].iloc[0]
+                if session_lo < session_hi:
+                    levels_dict['ny_open'] = opens[session_lo]
                     self.level_sources['ny_open'] = 'CURRENT_DATA'
                 else:
                     cached_price, is_valid, reason = self.cache_manager.get_cached_price('ny_open', current_time)
@@ -291,11 +415,11 @@ class PredictionEngine:
                         levels_dict['ny_open'] = cached_price
                         self.level_sources['ny_open'] = f'CACHE ({reason})'
                     else:
-                        levels_dict['ny_open'] = opens.iloc[-1]
+                        levels_dict['ny_open'] = opens[-1]
                         self.level_sources['ny_open'] = f'UNAVAILABLE ({reason})'
 
-                if len(preopen_data) > 0:
-                    levels_dict['ny_preopen'] = preopen_data['open'].iloc[0]
+                if preopen_lo < preopen_hi:
+                    levels_dict['ny_preopen'] = opens[preopen_lo]
                     self.level_sources['ny_preopen'] = 'CURRENT_DATA'
                 else:
                     cached_price, is_valid, reason = self.cache_manager.get_cached_price('ny_preopen', current_time)
@@ -303,245 +427,193 @@ class PredictionEngine:
                         levels_dict['ny_preopen'] = cached_price
                         self.level_sources['ny_preopen'] = f'CACHE ({reason})'
                     else:
-                        levels_dict['ny_preopen'] = opens.iloc[-1]
+                        levels_dict['ny_preopen'] = opens[-1]
                         self.level_sources['ny_preopen'] = f'UNAVAILABLE ({reason})'
             else:  # ES - Chicago market
                 # ES (Chicago) opens at 8:30 AM CT (which is 9:30 AM ET)
-                chicago_tz = pytz.timezone('America/Chicago')
-                current_time_chicago = current_time.astimezone(chicago_tz)
-                session_start = chicago_tz.localize(datetime.combine(current_time_chicago.date(), datetime.strptime('08:30', '%H:%M').time()))
-                preopen_start = chicago_tz.localize(datetime.combine(current_time_chicago.date(), datetime.strptime('17:00', '%H:%M').time())) - timedelta(days=1)  # Prev day 5 PM CT
+                chicago = self._chicago_bounds(current_time, unit)
+                session_lo, session_hi = self._window(ticks, chicago['chicago_open'], chicago['chicago_close'])
+                preopen_lo, preopen_hi = self._window(ticks, chicago['chicago_preopen'], chicago['chicago_open'])
 
-                session_data = df[(df.index >= session_start) & (df.index < session_start.replace(hour=15))]
-                preopen_data = df[(df.index >= preopen_start) & (df.index < session_start)]
-
-                if len(session_data) > 0:
-                    levels_dict['chicago_open'] = session_data['open'].iloc[0]
+                if session_lo < session_hi:
+                    levels_dict['chicago_open'] = opens[session_lo]
                     self.level_sources['chicago_open'] = 'CURRENT_DATA'
                 else:
-                    levels_dict['chicago_open'] = opens.iloc[-1]
+                    levels_dict['chicago_open'] = opens[-1]
                     self.level_sources['chicago_open'] = 'UNAVAILABLE (no session data)'
 
-                if len(preopen_data) > 0:
-                    levels_dict['chicago_preopen'] = preopen_data['open'].iloc[0]
+                if preopen_lo < preopen_hi:
+                    levels_dict['chicago_preopen'] = opens[preopen_lo]
                     self.level_sources['chicago_preopen'] = 'CURRENT_DATA'
                 else:
-                    levels_dict['chicago_preopen'] = opens.iloc[-1]
+                    levels_dict['chicago_preopen'] = opens[-1]
                     self.level_sources['chicago_preopen'] = 'UNAVAILABLE (no preopen data)'
         else:
             # London market opens at 8 AM GMT
-            session_start = today_start.replace(hour=8)
-            session_data = df[df.index >= session_start]
-            if len(session_data) > 0:
-                levels_dict['london_open'] = session_data['open'].iloc[0]
+            session_lo, session_hi = self._window(ticks, bounds['london_open'])
+            if session_lo < session_hi:
+                levels_dict['london_open'] = opens[session_lo]
                 self.level_sources['london_open'] = 'CURRENT_DATA'
             else:
-                levels_dict['london_open'] = opens.iloc[-1]
+                levels_dict['london_open'] = opens[-1]
                 self.level_sources['london_open'] = 'UNAVAILABLE (no session data)'
 
         # Previous day high/low
-        yesterday_start = today_start - timedelta(days=1)
-        yesterday_data = df[(df.index >= yesterday_start) & (df.index < today_start)]
+        yesterday_lo, yesterday_hi = self._window(ticks, bounds['yesterday_start'], today_start)
 
-        if len(yesterday_data) > 0:
-            levels_dict['prev_day_high'] = yesterday_data['high'].max()
-            levels_dict['prev_day_low'] = yesterday_data['low'].min()
+        if yesterday_lo < yesterday_hi:
+            levels_dict['prev_day_high'] = np.nanmax(highs[yesterday_lo:yesterday_hi])
+            levels_dict['prev_day_low'] = np.nanmin(lows[yesterday_lo:yesterday_hi])
             self.level_sources['prev_day_high'] = 'CURRENT_DATA'
             self.level_sources['prev_day_low'] = 'CURRENT_DATA'
         else:
-            levels_dict['prev_day_high'] = highs.iloc[-1]
-            levels_dict['prev_day_low'] = lows.iloc[-1]
+            levels_dict['prev_day_high'] = highs[-1]
+            levels_dict['prev_day_low'] = lows[-1]
             self.level_sources['prev_day_high'] = 'UNAVAILABLE (no yesterday data)'
             self.level_sources['prev_day_low'] = 'UNAVAILABLE (no yesterday data)'
 
         # Weekly levels
-        weekday = current_time.weekday()
-        days_since_monday = weekday
-        week_start = today_start - timedelta(days=days_since_monday)
-        week_data = df[df.index >= week_start]
-
-        if len(week_data) > 0:
-            levels_dict['weekly_open'] = week_data['open'].iloc[0]
-            levels_dict['weekly_high'] = week_data['high'].max()
-            levels_dict['weekly_low'] = week_data['low'].min()
+        week_lo, week_hi = self._window(ticks, bounds['week_start'])
+
+        if week_lo < week_hi:
+            levels_dict['weekly_open'] = opens[week_lo]
+            levels_dict['weekly_high'] = np.nanmax(highs[week_lo:week_hi])
+            levels_dict['weekly_low'] = np.nanmin(lows[week_lo:week_hi])
             self.level_sources['weekly_open'] = 'CURRENT_DATA'
             self.level_sources['weekly_high'] = 'CURRENT_DATA'
             self.level_sources['weekly_low'] = 'CURRENT_DATA'
         else:
-            levels_dict['weekly_open'] = opens.iloc[-1]
-            levels_dict['weekly_high'] = highs.iloc[-1]
-            levels_dict['weekly_low'] = lows.iloc[-1]
+            levels_dict['weekly_open'] = opens[-1]
+            levels_dict['weekly_high'] = highs[-1]
+            levels_dict['weekly_low'] = lows[-1]
             self.level_sources['weekly_open'] = 'UNAVAILABLE (no week data)'
             self.level_sources['weekly_high'] = 'UNAVAILABLE (no week data)'
             self.level_sources['weekly_low'] = 'UNAVAILABLE (no week data)'
 
         # Previous week
-        prev_week_start = week_start - timedelta(days=7)
-        prev_week_data = df[(df.index >= prev_week_start) & (df.index < week_start)]
+        prev_week_lo, prev_week_hi = self._window(ticks, bounds['prev_week_start'], bounds['week_start'])
 
-        if len(prev_week_data) > 0:
-            levels_dict['prev_week_high'] = prev_week_data['high'].max()
-            levels_dict['prev_week_low'] = prev_week_data['low'].min()
+        if prev_week_lo < prev_week_hi:
+            levels_dict['prev_week_high'] = np.nanmax(highs[prev_week_lo:prev_week_hi])
+            levels_dict['prev_week_low'] = np.nanmin(lows[prev_week_lo:prev_week_hi])
             self.level_sources['prev_week_high'] = 'CURRENT_DATA'
             self.level_sources['prev_week_low'] = 'CURRENT_DATA'
         else:
-            levels_dict['prev_week_high'] = highs.iloc[-1]
-            levels_dict['prev_week_low'] = lows.iloc[-1]
+            levels_dict['prev_week_high'] = highs[-1]
+            levels_dict['prev_week_low'] = lows[-1]
             self.level_sources['prev_week_high'] = 'UNAVAILABLE (no prev week data)'
             self.level_sources['prev_week_low'] = 'UNAVAILABLE (no prev week data)'
 
         # Monthly levels
-        month_start = self.tz.localize(datetime(current_time.year, current_time.month, 1))
-        month_data = df[df.index >= month_start]
+        month_lo, month_hi = self._window(ticks, bounds['month_start'])
 
-        if len(month_data) > 0:
-            levels_dict['monthly_open'] = month_data['open'].iloc[0]
+        if month_lo < month_hi:
+            levels_dict['monthly_open'] = opens[month_lo]
             self.level_sources['monthly_open'] = 'CURRENT_DATA'
         else:
-            levels_dict['monthly_open'] = opens.iloc[-1]
+            levels_dict['monthly_open'] = opens[-1]
             self.level_sources['monthly_open'] = 'UNAVAILABLE (no month data)'
 
         # Asian range (20:00 previous day - 00:00 current day, in instrument timezone)
-        try:
-            asian_start = self.tz.localize(datetime.combine(
-                current_date - timedelta(days=1),
-                datetime.min.time().replace(hour=20, minute=0, second=0, microsecond=0)
-            ))
-        except:
-            # Handle ambiguous times during DST transitions
-            asian_start = self.tz.localize(datetime.combine(
-                current_date - timedelta(days=1),
-                datetime.min.time().replace(hour=20, minute=0, second=0, microsecond=0)
-            ), is_dst=False)
-
-        asian_end = today_start
-        asian_data = df[(df.index >= asian_start) & (df.index < asian_end)]
+        asian_lo, asian_hi = self._window(ticks, bounds['asian_start'], today_start)
 
-        if len(asian_data) > 0:
-            levels_dict['asian_range_high'] = asian_data['high'].max()
-            levels_dict['asian_range_low'] = asian_data['low'].min()
+        if asian_lo < asian_hi:
+            levels_dict['asian_range_high'] = np.nanmax(highs[asian_lo:asian_hi])
+            levels_dict['asian_range_low'] = np.nanmin(lows[asian_lo:asian_hi])
             self.level_sources['asian_range_high'] = 'CURRENT_DATA'
             self.level_sources['asian_range_low'] = 'CURRENT_DATA'
         else:
-            levels_dict['asian_range_high'] = highs.iloc[-1]
-            levels_dict['asian_range_low'] = lows.iloc[-1]
+            levels_dict['asian_range_high'] = highs[-1]
+            levels_dict['asian_range_low'] = lows[-1]
             self.level_sources['asian_range_high'] = 'UNAVAILABLE (no asian range data)'
             self.level_sources['asian_range_low'] = 'UNAVAILABLE (no asian range data)'
 
         # London range (03:00 - 11:00 ET or 08:00 - 16:30 GMT)
-        london_start = today_start.replace(hour=3)
-        london_end = today_start.replace(hour=11)
-        london_data = df[(df.index >= london_start) & (df.index < london_end)]
+        london_lo, london_hi = self._window(ticks, bounds['london_start'], bounds['london_end'])
 
-        if len(london_data) > 0:
-            levels_dict['london_range_high'] = london_data['high'].max()
-            levels_dict['london_range_low'] = london_data['low'].min()
+        if london_lo < london_hi:
+            levels_dict['london_range_high'] = np.nanmax(highs[london_lo:london_hi])
+            levels_dict['london_range_low'] = np.nanmin(lows[london_lo:london_hi])
             self.level_sources['london_range_high'] = 'CURRENT_DATA'
             self.level_sources['london_range_low'] = 'CURRENT_DATA'
         else:
-            levels_dict['london_range_high'] = highs.iloc[-1]
-            levels_dict['london_range_low'] = lows.iloc[-1]
+            levels_dict['london_range_high'] = highs[-1]
+            levels_dict['london_range_low'] = lows[-1]
             self.level_sources['london_range_high'] = 'UNAVAILABLE (no london range data)'
             self.level_sources['london_range_low'] = 'UNAVAILABLE (no london range data)'
 
         # Trading range - NY for US100, Chicago for ES
         if self.instrument == 'US100':
             # NY range (09:30 AM - 14:00 ET)
-            range_start = today_start.replace(hour=9, minute=30)
-            range_end = today_start.replace(hour=14)
-            range_data = df[(df.index >= range_start) & (df.index < range_end)]
+            range_lo, range_hi = self._window(ticks, bounds['ny_open'], bounds['ny_range_end'])
 
-            if len(range_data) > 0:
-                levels_dict['ny_range_high'] = range_data['high'].max()
-                levels_dict['ny_range_low'] = range_data['low'].min()
+            if range_lo < range_hi:
+                levels_dict['ny_range_high'] = np.nanmax(highs[range_lo:range_hi])
+                levels_dict['ny_range_low'] = np.nanmin(lows[range_lo:range_hi])
                 self.level_sources['ny_range_high'] = 'CURRENT_DATA'
                 self.level_sources['ny_range_low'] = 'CURRENT_DATA'
             else:
-                levels_dict['ny_range_high'] = highs.iloc[-1]
-                levels_dict['ny_range_low'] = lows.iloc[-1]
+                levels_dict['ny_range_high'] = highs[-1]
+                levels_dict['ny_range_low'] = lows[-1]
                 self.level_sources['ny_range_high'] = 'UNAVAILABLE (no ny range data)'
                 self.level_sources['ny_range_low'] = 'UNAVAILABLE (no ny range data)'
         else:  # ES - Chicago market
             # Chicago range (08:30 AM - 14:00 CT / 9:30 AM - 15:00 ET)
-            chicago_tz = pytz.timezone('America/Chicago')
-            current_time_chicago = current_time.astimezone(chicago_tz)
-            chicago_today_start = chicago_tz.localize(datetime.combine(current_time_chicago.date(), datetime.min.time()))
-            range_start = chicago_today_start.replace(hour=8, minute=30)
-            range_end = chicago_today_start.replace(hour=14)
-            range_data = df[(df.index >= range_start) & (df.index < range_end)]
-
-            if len(range_data) > 0:
-                levels_dict['chicago_range_high'] = range_data['high'].max()
-                levels_dict['chicago_range_low'] = range_data['low'].min()
+            chicago = self._chicago_bounds(current_time, unit)
+            range_lo, range_hi = self._window(ticks, chicago['chicago_range_start'], chicago['chicago_range_end'])
+
+            if range_lo < range_hi:
+                levels_dict['chicago_range_high'] = np.nanmax(highs[range_lo:range_hi])
+                levels_dict['chicago_range_low'] = np.nanmin(lows[range_lo:range_hi])
                 self.level_sources['chicago_range_high'] = 'CURRENT_DATA'
                 self.level_sources['chicago_range_low'] = 'CURRENT_DATA'
             else:
-                levels_dict['chicago_range_high'] = highs.iloc[-1]
-                levels_dict['chicago_range_low'] = lows.iloc[-1]
+                levels_dict['chicago_range_high'] = highs[-1]
+                levels_dict['chicago_range_low'] = lows[-1]
                 self.level_sources['chicago_range_high'] = 'UNAVAILABLE (no chicago range data)'
                 self.level_sources['chicago_range_low'] = 'UNAVAILABLE (no chicago range data)'
 
-        return levels_dict, current_time
-
-    def _determine_available_levels(self, current_time, levels_dict: Dict) -> List[ReferenceLevel]:
-        """Determine which levels are available at the current time."""
-        available = []
-
-        for level in self.levels:
-            if level.level_type == 'ALWAYS_AVAILABLE':
-                if level.name in levels_dict:
-                    level.price = levels_dict[level.name]
-                    available.append(level)
-            else:  # CONDITIONAL
-                # Check if current time is past availability time
-                current_hour = current_time.hour
-                avail_hour = int(level.availability_time.split(':')[0])
-
-                if current_hour >= avail_hour:
-                    if level.name in levels_dict:
-                        level.price = levels_dict[level.name]
-                        available.append(level)
-
-        return available
-
-    def _normalize_weights(self, available_levels: List[ReferenceLevel]):
-        """Normalize weights to sum to 1.0000."""
-        total_base_weight = sum(l.base_weight for l in available_levels)
-
-        if total_base_weight == 0:
-            return
-
-        normalization_factor = 1.0 / total_base_weight
+        return levels_dict
 
-        for level in available_levels:
-            level.normalized_weight = level.base_weight * normalization_factor
+    def _determine_available_levels(self, current_time, levels_dict: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """Determine which levels are available at the current time.
 
-    def _apply_depreciation(self, available_levels: List[ReferenceLevel], current_price: float):
-        """Apply distance-based depreciation and calculate effective weights."""
-        for level in available_levels:
-            if level.price is None:
-                continue
-
-            # Calculate distance
-            distance = level.calculate_distance(current_price)
-            level.distance_percent = distance
-
-            # Apply depreciation
-            level.apply_depreciation(distance)
-
-            # Calculate effective weight
-            level.effective_weight = level.normalized_weight * level.depreciation
-
-            # Calculate direction (BULLISH if price > level, BEARISH if price < level)
-            level.direction = level.calculate_direction(current_price)
-
-            # Set position for output clarity
-            if level.direction == 'BULLISH':
-                level.position = 'BELOW'
-            elif level.direction == 'BEARISH':
-                level.position = 'ABOVE'
-            else:
-                level.position = 'AT'
+        Returns:
+            Tuple of (positions of the available levels, their prices)
+        """
+        # Conditional levels count once the current hour reaches their availability hour
+        template = self.template
+        in_session = template.always_available | (current_time.hour >= template.availability_hours)
+        available = np.flatnonzero(in_session & np.fromiter(
+            (name in levels_dict for name in template.names), dtype=bool, count=len(template.names)))
+        prices = np.fromiter((levels_dict[template.names[i]] for i in available),
+                             dtype=np.float64, count=len(available))
+        return available, prices
+
+    def _level_records(self, available: np.ndarray, prices: np.ndarray, scores: LevelScores) -> List[Dict]:
+        """Per-level output dictionaries for the available levels."""
+        template = self.template
+        numeric = np.stack([prices, scores.distances, template.base_weights[available],
+                            scores.normalized, scores.depreciations, scores.effective])
+
+        # Round each numeric column in one call; price, distance and the normalized and
+        # effective weights are reported as None when zero
+        rounded = np.empty_like(numeric)
+        for row, decimals in enumerate(LEVEL_DECIMALS):
+            np.round(numeric[row], decimals, out=rounded[row])
+        columns = np.where(LEVEL_OPTIONAL & (numeric == 0), None, rounded).tolist()
+
+        return [
+            dict(zip(LEVEL_KEYS, row))
+            for row in zip(
+                (template.names[level] for level in available),
+                template.level_types[available].tolist(),
+                columns[0],
+                POSITION_NAMES[scores.directions + 1].tolist(),
+                *columns[1:],
+                DIRECTION_NAMES[scores.directions + 1].tolist(),
+            )
+        ]
 
     def analyze(self, df: pd.DataFrame, timestamp: str = None) -> Dict[str, Any]:
         """Analyze price data and generate prediction output.
@@ -556,58 +628,47 @@ class PredictionEngine:
         if df is None or len(df) == 0:
             return self._empty_result(timestamp)
 
+        # Fresh source map per run so earlier results aren't mutated when the engine is reused
+        self.level_sources = {}
+
+        # Level windows are bisected on the index as int64 ticks, which are UTC-based
+        # only for a timezone-aware index and need rows in time order; callers pass
+        # uploaded CSVs as-is, so restore the order when it is broken
+        if df.index.tz is None:
+            raise TypeError("analyze needs a timezone-aware DatetimeIndex")
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index(kind='stable')
+        ticks = df.index.asi8
+
+        # Time of the last bar in the instrument timezone; the levels are always measured from it
+        data_time = self._to_instrument_tz(df.index[-1])
+
         # Use provided timestamp or last index value
         if timestamp is None:
-            current_time = df.index[-1]
-            if current_time.tzinfo is None:
-                current_time = self.tz.localize(current_time)
-            else:
-                current_time = current_time.astimezone(self.tz)
+            current_time = data_time
         else:
             try:
-                current_time = pd.to_datetime(timestamp)
-                if current_time.tzinfo is None:
-                    current_time = self.tz.localize(current_time)
-                else:
-                    current_time = current_time.astimezone(self.tz)
+                current_time = self._to_instrument_tz(pd.to_datetime(timestamp))
             except:
                 current_time = df.index[-1]
 
         current_price = df['close'].iloc[-1]
 
         # Calculate all reference levels
-        levels_dict, _ = self._calculate_levels(df)
+        levels_dict = self._calculate_levels(df, data_time, ticks)
 
         # Determine available levels
-        available_levels = self._determine_available_levels(current_time, levels_dict)
+        available, prices = self._determine_available_levels(current_time, levels_dict)
 
-        if not available_levels:
+        if len(available) == 0:
             return self._empty_result(timestamp)
 
-        # Normalize weights
-        self._normalize_weights(available_levels)
-
-        # Apply depreciation
-        self._apply_depreciation(available_levels, current_price)
-
-        # Calculate directional bias
-        bullish_weight = sum(l.effective_weight for l in available_levels if l.direction == 'BULLISH')
-        bearish_weight = sum(l.effective_weight for l in available_levels if l.direction == 'BEARISH')
-
-        # Determine bias (binary: BULLISH or BEARISH)
-        if bullish_weight >= bearish_weight:
-            bias = 'BULLISH'
-        else:
-            bias = 'BEARISH'
-
-        # Calculate confidence (0-100%)
-        total_weight = bullish_weight + bearish_weight
-        max_weight = max(bullish_weight, bearish_weight) if total_weight > 0 else 0
-        confidence = (max_weight / total_weight * 100) if total_weight > 0 else 0
+        # Normalize weights, apply depreciation and calculate directional bias and confidence
+        scores = score_levels(prices, self.template.base_weights[available], current_price)
 
         # Calculate weight utilization
-        available_count = len(available_levels)
-        total_count = len(self.levels)
+        available_count = len(available)
+        total_count = len(self.template.names)
         utilization = available_count / total_count if total_count > 0 else 0
 
         # Update cache with newly extracted data
@@ -623,17 +684,17 @@ class PredictionEngine:
                 'data_points': len(df)
             },
             'analysis': {
-                'bias': bias,
-                'confidence': round(confidence, 2),
-                'bullish_weight': round(bullish_weight, 4),
-                'bearish_weight': round(bearish_weight, 4)
+                'bias': scores.bias,
+                'confidence': round(scores.confidence, 2),
+                'bullish_weight': round(scores.bullish_weight, 4),
+                'bearish_weight': round(scores.bearish_weight, 4)
             },
             'weights': {
                 'available_levels': available_count,
                 'total_levels': total_count,
                 'utilization': round(utilization, 4)
             },
-            'levels': [l.to_dict() for l in available_levels],
+            'levels': self._level_records(available, prices, scores),
             'level_sources': self.level_sources  # Include source information
         }
 
@@ -657,7 +718,7 @@ class PredictionEngine:
             },
             'weights': {
                 'available_levels': 0,
-                'total_levels': len(self.levels),
+                'total_levels': len(self.template.names),
                 'utilization': 0.0
             },
             'levels': []
@@ -672,19 +733,24 @@ class OutputFormatter:
         """Format result as JSON-compatible dictionary."""
         return result
 
+    CSV_COLUMNS = ('name', 'price', 'position', 'distance_percent', 'effective_weight', 'direction')
+
     @staticmethod
     def format_csv(result: Dict) -> str:
         """Format levels as CSV string."""
-        if not result.get('levels'):
-            return 'name,price,position,distance_percent,effective_weight,direction'
-
-        lines = ['name,price,position,distance_percent,effective_weight,direction']
-
-        for level in result['levels']:
-            line = f"{level['name']},{level['price']},{level['position']},{level['distance_percent']},{level['effective_weight']},{level['direction']}"
-            lines.append(line)
-
-        return '\n'.join(lines)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(OutputFormatter.CSV_COLUMNS)
+
+        # Missing values are written as 'None', as in earlier exports
+        row_values = itemgetter(*OutputFormatter.CSV_COLUMNS)
+        writer.writerows(
+            ['None' if value is None else value for value in row_values(level)]
+            for level in result.get('levels') or ()
+        )
+
+        # No trailing newline after the last row
+        return buffer.getvalue()[:-1]
 
     @staticmethod
     def format_summary(result: Dict) -> str:
@@ -96,7 +96,7 @@ def get_all_instruments() -> list:
 
 
 def log_weight_change(instrument: str, old_weights: dict, new_weights: dict,
-                      user: str = None, reason: str = None) -> None:
+                      user: str = None, reason: str = None, changes: dict = None) -> None:
     """
     Log a weight change.
 
@@ -106,9 +106,10 @@ def log_weight_change(instrument: str, old_weights: dict, new_weights: dict,
         new_weights: New weight values
         user: Optional user who made the change
         reason: Optional reason for the change
+        changes: Optional precomputed delta of the changed levels
     """
     service = get_logging_service()
-    service.log_weight_change(instrument, old_weights, new_weights, user, reason)
+    service.log_weight_change(instrument, old_weights, new_weights, user, reason, changes)
 
 
 def get_weight_change_history(instrument: str = None, days: int = 30) -> list:
@@ -190,6 +191,20 @@ def get_predictions_by_instrument(instrument: str) -> list:
     return service.get_predictions_by_instrument(instrument)
 
 
+def get_latest_prediction(instrument: str) -> dict:
+    """
+    Get the most recently analyzed prediction for an instrument.
+
+    Args:
+        instrument: Instrument code
+
+    Returns:
+        Latest prediction or None
+    """
+    service = get_storage_service()
+    return service.get_latest_prediction(instrument)
+
+
 def get_top_predictions(n: int = 50) -> list:
     """
     Get top N predictions by data timestamp.
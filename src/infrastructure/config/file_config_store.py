@@ -4,6 +4,7 @@ Handles JSON file I/O for weight configurations
 """
 import json
 import logging
+import os
 from pathlib import Path
 from typing import Dict, Any
 
@@ -36,10 +37,9 @@ class FileConfigStore:
         """
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r') as f:
-                    data = json.load(f)
-                    logger.info(f"Loaded config from {self.config_path}")
-                    return data
+                data = json.loads(self.config_path.read_bytes())
+                logger.info(f"Loaded config from {self.config_path}")
+                return data
             else:
                 logger.warning(f"Config file not found: {self.config_path}")
                 return {}
@@ -51,13 +51,19 @@ class FileConfigStore:
         """
         Save configuration to JSON file.
 
+        The file is written to a temporary sibling and then atomically renamed
+        over the config, so a failed save never leaves a truncated file.
+
         Args:
             data: Dictionary of instruments and their weights
         """
+        tmp_path = self.config_path.with_name(self.config_path.name + '.tmp')
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            payload = json.dumps(data, indent=2)
+            tmp_path.write_text(payload)
+            os.replace(tmp_path, self.config_path)
             logger.info(f"Saved config to {self.config_path}")
         except Exception as e:
             logger.error(f"Failed to save config: {e}")
+            tmp_path.unlink(missing_ok=True)
             raise
@@ -43,8 +43,7 @@ class FileLogStore:
             # Load existing logs or create empty list
             logs = []
             if log_file.exists():
-                with open(log_file, 'r') as f:
-                    logs = json.load(f)
+                logs = json.loads(log_file.read_bytes())
 
             # Append new entry
             logs.append(log_entry)
@@ -73,9 +72,7 @@ class FileLogStore:
             # Get all JSON files in log directory
             for log_file in sorted(self.log_path.glob("*.json"), reverse=True):
                 try:
-                    with open(log_file, 'r') as f:
-                        file_logs = json.load(f)
-                        logs.extend(file_logs)
+                    logs.extend(json.loads(log_file.read_bytes()))
                 except Exception as e:
                     logger.warning(f"Failed to load {log_file}: {e}")
 
@@ -4,12 +4,17 @@ Handles file I/O for prediction storage
 """
 import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Threads used to read prediction files when scanning the whole directory
+LOAD_WORKERS = 8
+
 
 class JSONStorageBackend:
     """
@@ -26,6 +31,10 @@ class JSONStorageBackend:
         """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        # Instrument -> (analysis_timestamp, key) of the latest prediction, built lazily
+        self._latest_index: Optional[Dict[str, Tuple[str, str]]] = None
+        # Guards building and updating the index; Home.py reads it from several threads
+        self._index_lock = threading.Lock()
         logger.info(f"JSONStorageBackend initialized with path: {self.storage_path}")
 
     def save(self, key: str, data: Dict[str, Any]) -> bool:
@@ -44,6 +53,11 @@ class JSONStorageBackend:
             with open(file_path, 'w') as f:
                 json.dump(data, f, indent=2)
             logger.info(f"Saved prediction to {file_path}")
+            with self._index_lock:
+                index = self._latest_index
+                if index is not None and not self._index_prediction(index, key, data):
+                    # The indexed prediction was overwritten with an older one; rescan on next read
+                    self._latest_index = None
             return True
         except Exception as e:
             logger.error(f"Failed to save prediction: {e}")
@@ -62,8 +76,7 @@ class JSONStorageBackend:
         try:
             file_path = self.storage_path / f"{key}.json"
             if file_path.exists():
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
+                data = json.loads(file_path.read_bytes())
                 logger.info(f"Loaded prediction from {file_path}")
                 return data
             else:
@@ -88,24 +101,23 @@ class JSONStorageBackend:
             predictions = []
             for json_file in sorted(self.storage_path.glob("*.json"), reverse=True):
                 try:
-                    with open(json_file, 'r') as f:
-                        pred = json.load(f)
-
-                        # Apply filters
-                        if filters:
-                            match = True
-                            for key, value in filters.items():
-                                if pred.get(key) != value:
-                                    match = False
-                                    break
-                            if not match:
-                                continue
-
-                        predictions.append(pred)
-
-                        # Check limit
-                        if len(predictions) >= limit:
-                            break
+                    pred = json.loads(json_file.read_bytes())
+
+                    # Apply filters
+                    if filters:
+                        match = True
+                        for key, value in filters.items():
+                            if pred.get(key) != value:
+                                match = False
+                                break
+                        if not match:
+                            continue
+
+                    predictions.append(pred)
+
+                    # Check limit
+                    if len(predictions) >= limit:
+                        break
                 except Exception as e:
                     logger.warning(f"Failed to load {json_file.name}: {e}")
 
@@ -141,15 +153,11 @@ class JSONStorageBackend:
             List of predictions for the instrument
         """
         try:
-            predictions = []
-            for json_file in sorted(self.storage_path.glob("*.json"), reverse=True):
-                try:
-                    with open(json_file, 'r') as f:
-                        pred = json.load(f)
-                        if pred.get('instrument') == instrument:
-                            predictions.append(pred)
-                except Exception as e:
-                    logger.warning(f"Failed to load {json_file.name}: {e}")
+            files = sorted(self.storage_path.glob("*.json"), reverse=True)
+            predictions = [
+                pred for _, pred in self._read_files(files)
+                if pred.get('instrument') == instrument
+            ]
 
             logger.info(f"Found {len(predictions)} predictions for {instrument}")
             return predictions
@@ -157,6 +165,79 @@ class JSONStorageBackend:
             logger.error(f"Failed to list predictions by instrument: {e}")
             return []
 
+    def latest_by_instrument(self, instrument: str) -> Dict[str, Any]:
+        """
+        Get the most recently analyzed prediction for an instrument.
+
+        Uses an in-memory index of the latest key per instrument so only a
+        single file is read once the index has been built.
+
+        Args:
+            instrument: Instrument code (e.g., 'US100')
+
+        Returns:
+            Latest prediction for the instrument or empty dict if none
+        """
+        try:
+            with self._index_lock:
+                # Concurrent first reads wait here for one scan instead of each running their own
+                if self._latest_index is None:
+                    self._latest_index = self._build_latest_index()
+                entry = self._latest_index.get(instrument)
+            if entry is None:
+                return {}
+            return self.load(entry[1])
+        except Exception as e:
+            logger.error(f"Failed to get latest prediction for {instrument}: {e}")
+            return {}
+
+    def _build_latest_index(self) -> Dict[str, Tuple[str, str]]:
+        """Scan all prediction files once to build the latest-per-instrument index."""
+        index = {}
+        for json_file, pred in self._read_files(list(self.storage_path.glob("*.json"))):
+            self._index_prediction(index, json_file.stem, pred)
+        return index
+
+    @staticmethod
+    def _read_files(files: List[Path]) -> List[Tuple[Path, Dict[str, Any]]]:
+        """
+        Read and parse prediction files concurrently, keeping their order.
+
+        File reads release the GIL, so a small thread pool overlaps the I/O.
+        Files that cannot be read or parsed are logged and skipped.
+        """
+        def read(json_file: Path) -> Optional[Dict[str, Any]]:
+            try:
+                return json.loads(json_file.read_bytes())
+            except Exception as e:
+                logger.warning(f"Failed to load {json_file.name}: {e}")
+                return None
+
+        if len(files) < 2:
+            parsed = map(read, files)
+        else:
+            with ThreadPoolExecutor(max_workers=min(LOAD_WORKERS, len(files))) as pool:
+                parsed = list(pool.map(read, files))
+        return [(json_file, pred) for json_file, pred in zip(files, parsed) if pred is not None]
+
+    @staticmethod
+    def _index_prediction(index: Dict[str, Tuple[str, str]], key: str, data: Dict[str, Any]) -> bool:
+        """
+        Record key in the index if it is the newest prediction for its instrument.
+
+        Returns:
+            False if key was the indexed entry but now holds an older prediction
+        """
+        instrument = data.get('instrument')
+        if instrument is None:
+            return True
+        timestamp = data.get('analysis_timestamp') or ''
+        current = index.get(instrument)
+        if current is None or timestamp >= current[0]:
+            index[instrument] = (timestamp, key)
+            return True
+        return current[1] != key
+
     def delete(self, key: str) -> bool:
         """
         Delete a prediction file.
@@ -171,6 +252,9 @@ class JSONStorageBackend:
             file_path = self.storage_path / f"{key}.json"
             if file_path.exists():
                 file_path.unlink()
+                # Rebuild the index lazily in case the latest prediction was removed
+                with self._index_lock:
+                    self._latest_index = None
                 logger.info(f"Deleted {file_path}")
                 return True
             else:
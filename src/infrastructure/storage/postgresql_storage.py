@@ -321,6 +321,39 @@ class PostgreSQLStorageBackend:
                 cursor.close()
                 self._release_connection(conn)
 
+    def latest_by_instrument(self, instrument: str) -> Dict[str, Any]:
+        """
+        Get the most recently analyzed prediction for an instrument.
+
+        Args:
+            instrument: Instrument code (e.g., 'US100')
+
+        Returns:
+            Latest prediction for the instrument or empty dict if none
+        """
+        conn = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+            cursor.execute("""
+                SELECT data FROM predictions
+                WHERE instrument = %s
+                ORDER BY analysis_timestamp DESC NULLS LAST
+                LIMIT 1;
+            """, (instrument,))
+
+            result = cursor.fetchone()
+            return result['data'] if result else {}
+
+        except Exception as e:
+            logger.error(f"Failed to get latest prediction for {instrument}: {e}")
+            return {}
+        finally:
+            if conn:
+                cursor.close()
+                self._release_connection(conn)
+
     def delete(self, key: str) -> bool:
         """
         Delete a prediction from PostgreSQL.
@@ -136,6 +136,18 @@ class StorageService(Protocol):
         """
         ...
 
+    def latest_by_instrument(self, instrument: str) -> Dict[str, Any]:
+        """
+        Get the most recent item for a specific instrument.
+
+        Args:
+            instrument: Instrument code (e.g., 'US100')
+
+        Returns:
+            Latest item for the instrument or empty dict if none
+        """
+        ...
+
     def delete(self, key: str) -> bool:
         """
         Delete an item from storage.
@@ -259,6 +271,18 @@ class PredictionStorageService(Protocol):
         """
         ...
 
+    def get_latest_prediction(self, instrument: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recently analyzed prediction for an instrument.
+
+        Args:
+            instrument: Instrument code
+
+        Returns:
+            Latest prediction or None if none exist
+        """
+        ...
+
     def delete_prediction(self, filename: str) -> bool:
         """
         Delete a specific prediction.
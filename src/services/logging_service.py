@@ -62,7 +62,8 @@ class LoggingService:
 
     # Weight change tracking methods
     def log_weight_change(self, instrument: str, old_weights: Dict[str, float],
-                          new_weights: Dict[str, float], user: str = None, reason: str = None):
+                          new_weights: Dict[str, float], user: str = None, reason: str = None,
+                          changes: Dict[str, Dict[str, float]] = None):
         """
         Log a weight adjustment.
 
@@ -72,21 +73,26 @@ class LoggingService:
             new_weights: Dictionary of new weight values
             user: Optional user who made the change
             reason: Optional reason for the change
+            changes: Optional precomputed delta ({level: {'old', 'new', 'change'}});
+                computed from old_weights/new_weights if not given
         """
         timestamp = datetime.now()
 
         # Identify which weights changed
-        changed_weights = {}
-        for level_name in new_weights:
-            old_value = old_weights.get(level_name, 0.0)
-            new_value = new_weights.get(level_name, 0.0)
-
-            if abs(old_value - new_value) > 0.00001:
-                changed_weights[level_name] = {
-                    'old': old_value,
-                    'new': new_value,
-                    'change': new_value - old_value
-                }
+        if changes is not None:
+            changed_weights = changes
+        else:
+            changed_weights = {}
+            for level_name in new_weights:
+                old_value = old_weights.get(level_name, 0.0)
+                new_value = new_weights.get(level_name, 0.0)
+
+                if abs(old_value - new_value) > 0.00001:
+                    changed_weights[level_name] = {
+                        'old': old_value,
+                        'new': new_value,
+                        'change': new_value - old_value
+                    }
 
         if not changed_weights:
             logger.info(f"No weight changes detected for {instrument}")
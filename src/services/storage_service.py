@@ -107,6 +107,18 @@ class StorageService:
         """
         return self.backend.list_by_instrument(instrument)
 
+    def latest_by_instrument(self, instrument: str) -> Dict[str, Any]:
+        """
+        Get the most recent item for a specific instrument.
+
+        Args:
+            instrument: Instrument code (e.g., 'US100')
+
+        Returns:
+            Latest item for the instrument or empty dict if none
+        """
+        return self.backend.latest_by_instrument(instrument)
+
     def delete(self, key: str) -> bool:
         """
         Delete an item from storage.
@@ -213,6 +225,18 @@ class StorageService:
         """
         return self.backend.list_by_instrument(instrument)
 
+    def get_latest_prediction(self, instrument: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recently analyzed prediction for an instrument.
+
+        Args:
+            instrument: Instrument code (e.g., 'US100')
+
+        Returns:
+            Latest prediction or None if the instrument has no predictions
+        """
+        return self.backend.latest_by_instrument(instrument) or None
+
     def get_predictions_by_date_range(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
         """
         Get predictions within date range (by data timestamp).
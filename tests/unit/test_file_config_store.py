@@ -94,3 +94,15 @@ def test_save_and_load_roundtrip(temp_config_path):
     assert loaded_data == original_data
     assert len(loaded_data["US100"]) == 3
     assert loaded_data["US500"]["chicago_open"] == 0.0779
+
+
+def test_save_failure_keeps_existing_file(temp_config_path):
+    """Test that a failed save leaves the previous config intact."""
+    store = FileConfigStore(temp_config_path)
+    store.save({"US100": {"daily_midnight": 0.5}})
+
+    with pytest.raises(TypeError):
+        store.save({"US100": {"daily_midnight": object()}})
+
+    assert store.load() == {"US100": {"daily_midnight": 0.5}}
+    assert list(temp_config_path.parent.glob("*.tmp")) == []
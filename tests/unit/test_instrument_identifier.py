@@ -0,0 +1,33 @@
+"""
+Unit tests for upload filename instrument detection
+"""
+import pytest
+from instrument_identifier import ES_UPLOAD_RULES, US500_UPLOAD_RULES, instrument_from_upload_name
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("futures_NQ_1m.csv", "US100"),
+    ("prices_NQ.csv", "US100"),
+    ("candles_nq.csv", "US100"),
+    ("ES_prices.csv", "US500"),
+    ("sp_data.csv", "US500"),
+    ("US500_1m.csv", "US500"),
+    ("UK100_data.csv", "UK100"),
+    ("ftse.csv", "UK100"),
+    ("data.csv", "US100"),
+])
+def test_us500_upload_rules(filename, expected):
+    """Test that NQ files are not claimed by the "es" in words like "futures"."""
+    assert instrument_from_upload_name(filename, US500_UPLOAD_RULES) == expected
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("prices_NQ.csv", "US100"),
+    ("futures_NQ.csv", "US100"),
+    ("ES_1m.csv", "ES"),
+    ("FTSE_data.csv", "UK100"),
+    ("data.csv", "US100"),
+])
+def test_es_upload_rules(filename, expected):
+    """Test that app.py's rules also check NQ before ES."""
+    assert instrument_from_upload_name(filename, ES_UPLOAD_RULES) == expected
@@ -83,6 +83,20 @@ def test_list_by_instrument(temp_storage_path):
     assert all(p["instrument"] == "US100" for p in us100_predictions)
 
 
+def test_list_by_instrument_skips_unreadable_files(temp_storage_path):
+    """Test that a corrupt file does not hide the other predictions."""
+    backend = JSONStorageBackend(temp_storage_path)
+
+    for i in range(10):
+        backend.save(f"us100_{i}", {"instrument": "US100", "id": i})
+    (temp_storage_path / "us100_corrupt.json").write_text("{not json")
+
+    us100_predictions = backend.list_by_instrument("US100")
+
+    # Newest key first, matching the serial scan order
+    assert [p["id"] for p in us100_predictions] == list(range(9, -1, -1))
+
+
 def test_query_with_filters(temp_storage_path):
     """Test querying predictions with filters."""
     backend = JSONStorageBackend(temp_storage_path)
@@ -165,3 +179,56 @@ def test_save_load_roundtrip(temp_storage_path):
     assert loaded == original
     assert loaded["analysis"]["bias"] == "BEARISH"
     assert loaded["data_length"] == 100
+
+
+def test_latest_by_instrument(temp_storage_path):
+    """Test getting the most recently analyzed prediction for an instrument."""
+    backend = JSONStorageBackend(temp_storage_path)
+
+    backend.save("us100_a", {"instrument": "US100", "analysis_timestamp": "2024-11-23T10:00:00"})
+    backend.save("us100_b", {"instrument": "US100", "analysis_timestamp": "2024-11-23T12:00:00"})
+    backend.save("uk100_a", {"instrument": "UK100", "analysis_timestamp": "2024-11-23T15:00:00"})
+
+    latest = backend.latest_by_instrument("US100")
+
+    assert latest["analysis_timestamp"] == "2024-11-23T12:00:00"
+    assert backend.latest_by_instrument("US500") == {}
+
+
+def test_latest_by_instrument_tracks_saves_and_deletes(temp_storage_path):
+    """Test that the latest index follows new saves and deletions."""
+    backend = JSONStorageBackend(temp_storage_path)
+
+    backend.save("us100_a", {"instrument": "US100", "analysis_timestamp": "2024-11-23T10:00:00"})
+    assert backend.latest_by_instrument("US100")["analysis_timestamp"] == "2024-11-23T10:00:00"
+
+    backend.save("us100_b", {"instrument": "US100", "analysis_timestamp": "2024-11-23T12:00:00"})
+    assert backend.latest_by_instrument("US100")["analysis_timestamp"] == "2024-11-23T12:00:00"
+
+    backend.delete("us100_b")
+    assert backend.latest_by_instrument("US100")["analysis_timestamp"] == "2024-11-23T10:00:00"
+
+
+def test_latest_by_instrument_builds_index_once_across_threads(temp_storage_path, monkeypatch):
+    """Test that concurrent first reads share a single index scan."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    backend = JSONStorageBackend(temp_storage_path)
+    for instrument in ("US100", "US500", "UK100"):
+        backend.save(f"{instrument.lower()}_a", {"instrument": instrument, "analysis_timestamp": "2024-11-23T10:00:00"})
+    backend._latest_index = None
+
+    builds = []
+    build = backend._build_latest_index
+
+    def counting_build():
+        builds.append(1)
+        return build()
+
+    monkeypatch.setattr(backend, "_build_latest_index", counting_build)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(backend.latest_by_instrument, ("US100", "US500", "UK100")))
+
+    assert len(builds) == 1
+    assert [r["instrument"] for r in results] == ["US100", "US500", "UK100"]
@@ -88,6 +88,31 @@ def test_no_change_detection(logging_service):
     assert len(history) == 0
 
 
+def test_log_weight_change_with_precomputed_changes(logging_service):
+    """Test that a precomputed delta is logged as given."""
+    old_weights = {'level_1': 0.5, 'level_2': 0.3, 'level_3': 0.2}
+    new_weights = {'level_1': 0.6, 'level_2': 0.2, 'level_3': 0.2}
+    changes = {
+        'level_1': {'old': 0.5, 'new': 0.6, 'change': 0.1},
+        'level_2': {'old': 0.3, 'new': 0.2, 'change': -0.1},
+    }
+
+    logging_service.log_weight_change(
+        instrument='US100',
+        old_weights=old_weights,
+        new_weights=new_weights,
+        user='test_user',
+        reason='Testing',
+        changes=changes
+    )
+
+    history = logging_service.get_change_history(instrument='US100')
+    assert len(history) == 1
+    assert history[0]['changes'] == changes
+    assert history[0]['num_changed_levels'] == 2
+    assert history[0]['new_total'] == pytest.approx(1.0)
+
+
 def test_load_recent_logs(logging_service):
     """Test loading recent logs."""
     # Add some entries
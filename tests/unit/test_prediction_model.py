@@ -0,0 +1,45 @@
+"""
+Unit tests for PredictionEngine
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from prediction_model_v3 import PredictionEngine
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """US100 engine whose price cache is written under a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    return PredictionEngine(instrument='US100')
+
+
+@pytest.fixture
+def ohlc():
+    """Three days of 1-minute bars ending on a Wednesday afternoon (New York time)."""
+    index = pd.date_range('2025-11-17 00:00', '2025-11-19 15:00', freq='1min', tz='America/New_York')
+    rng = np.random.default_rng(0)
+    close = 20000 + np.cumsum(rng.normal(0, 5, len(index)))
+    return pd.DataFrame({'open': close, 'high': close + 2, 'low': close - 2, 'close': close}, index=index)
+
+
+def test_analyze_out_of_order_rows(engine, ohlc):
+    """Test that a row out of time order does not change the level windows."""
+    # Move the bar with yesterday's high to the top of the frame
+    yesterday = ohlc.loc['2025-11-18']
+    high_time = yesterday['high'].idxmax()
+    shuffled = pd.concat([ohlc.loc[[high_time]], ohlc.drop(high_time)])
+
+    expected = engine.analyze(ohlc)
+    result = engine.analyze(shuffled)
+
+    levels = {level['name']: level['price'] for level in result['levels']}
+    assert levels['prev_day_high'] == round(yesterday['high'].max(), 2)
+    assert result['levels'] == expected['levels']
+    assert result['analysis'] == expected['analysis']
+
+
+def test_analyze_rejects_naive_index(engine, ohlc):
+    """Test that a timezone-naive index is rejected rather than bisected as UTC ticks."""
+    with pytest.raises(TypeError):
+        engine.analyze(ohlc.tz_localize(None))
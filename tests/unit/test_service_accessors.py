@@ -20,6 +20,7 @@ from src.di.accessors import (
     load_all_predictions,
     get_prediction_count,
     get_predictions_by_instrument,
+    get_latest_prediction,
     get_top_predictions,
     delete_prediction,
     get_storage_info,
@@ -201,6 +202,16 @@ def test_get_predictions_by_instrument():
     assert us100_preds[0]['instrument'] == 'US100'
 
 
+def test_get_latest_prediction():
+    """Test getting the latest prediction for an instrument."""
+    save_prediction({'instrument': 'US100', 'timestamp': '2024-11-23T10:30:00'})
+    save_prediction({'instrument': 'US100', 'timestamp': '2024-11-23T11:30:00'})
+
+    latest = get_latest_prediction('US100')
+    assert latest['analysis_timestamp'] == '2024-11-23T11:30:00'
+    assert get_latest_prediction('UK100') is None
+
+
 def test_get_top_predictions():
     """Test getting top N predictions."""
     # Save some
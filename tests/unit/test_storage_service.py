@@ -72,6 +72,21 @@ def test_get_predictions_by_instrument(storage_service):
     assert us100_preds[0]['instrument'] == 'US100'
 
 
+def test_get_latest_prediction(storage_service):
+    """Test getting the latest prediction for an instrument."""
+    for hour in (10, 12, 11):
+        storage_service.save_prediction({
+            'instrument': 'US100',
+            'timestamp': f'2024-11-23T{hour}:30:00'
+        })
+
+    latest = storage_service.get_latest_prediction('US100')
+    assert latest['analysis_timestamp'] == '2024-11-23T12:30:00'
+
+    # No predictions for instrument
+    assert storage_service.get_latest_prediction('UK100') is None
+
+
 def test_load_all_predictions(storage_service):
     """Test loading all predictions."""
     # Save multiple predictions